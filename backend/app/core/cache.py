@@ -0,0 +1,477 @@
+from app.core.redis import redis_client
+from app.core import metrics
+from app.core.singleflight import SingleFlight
+from app.core.serializer import dump_json, serialize
+from app.core.compression import negotiate_encoding, precompress
+from app.db.session import AsyncSessionLocal
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from dotenv import load_dotenv
+from functools import wraps
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import hashlib
+import inspect
+import logging
+import random
+import json
+import time
+import uuid
+import os
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = os.getenv("CACHE_PREFIX", "cache")
+CACHE_STALE_TTL = int(os.getenv("CACHE_STALE_TTL", "300"))
+CACHE_JITTER = float(os.getenv("CACHE_JITTER", "0.1"))
+CACHE_LOCK_TTL = float(os.getenv("CACHE_LOCK_TTL", "10"))
+CACHE_LOCK_WAIT = float(os.getenv("CACHE_LOCK_WAIT", "3"))
+CACHE_LOCK_POLL = float(os.getenv("CACHE_LOCK_POLL", "0.05"))
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+CACHE_L1_MAX_BYTES = int(os.getenv("CACHE_L1_MAX_BYTES", str(64 * 1024 * 1024)))
+CACHE_L1_TTL = float(os.getenv("CACHE_L1_TTL", "30"))
+CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache:invalidate")
+CACHE_CONTROL = os.getenv("CACHE_CONTROL", "no-cache")
+REQUEST_PARAM = "cache_request"
+
+
+class LocalCache:
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._items: OrderedDict[str, Tuple[float, dict, int]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[dict]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires_at, entry, _ = item
+        if expires_at <= time.monotonic():
+            self.discard(key)
+            return None
+        self._items.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: dict, size: int):
+        if size > self.max_bytes:
+            return
+        self.discard(key)
+        self._items[key] = (time.monotonic() + self.ttl, entry, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, _, evicted) = self._items.popitem(last=False)
+            self.size -= evicted
+            metrics.incr("cache.l1.evictions")
+
+    def discard(self, key: str):
+        item = self._items.pop(key, None)
+        if item is not None:
+            self.size -= item[2]
+
+    def clear(self):
+        self._items.clear()
+        self.size = 0
+
+    def stats(self) -> dict:
+        return {"keys": len(self._items), "bytes": self.size}
+
+
+local_cache = LocalCache(CACHE_L1_MAX_BYTES, CACHE_L1_TTL)
+flights = SingleFlight()
+_listener_task: Optional[asyncio.Task] = None
+_invalidation_hooks: List[Callable[[Optional[List[str]]], None]] = []
+
+
+def build_cache_key(namespace: str, key: str) -> str:
+    return f"{CACHE_PREFIX}:{namespace}:{key}"
+
+
+def build_tag_key(tag: str) -> str:
+    return f"{CACHE_PREFIX}:tag:{tag}"
+
+
+async def cache_get(key: str) -> Optional[bytes]:
+    try:
+        return await redis_client.get(key)
+    except Exception as e:
+        logger.warning("Cache read failed for %s: %s", key, e)
+        return None
+
+
+async def cache_lookup(key: str, local: bool) -> Optional[dict]:
+    if local:
+        entry = local_cache.get(key)
+        if entry is not None:
+            metrics.incr("cache.l1.hit")
+            return entry
+        metrics.incr("cache.l1.miss")
+    raw = await cache_get(key)
+    entry = decode_entry(raw)
+    if entry is None:
+        metrics.incr("cache.l2.miss")
+        return None
+    metrics.incr("cache.l2.hit")
+    if local:
+        local_cache.set(key, entry, len(raw))
+    return entry
+
+
+async def cache_lookup_many(keys: List[str], local: bool) -> List[Optional[dict]]:
+    entries: List[Optional[dict]] = [None] * len(keys)
+    remote = []
+    for idx, key in enumerate(keys):
+        entry = local_cache.get(key) if local else None
+        if entry is not None:
+            metrics.incr("cache.l1.hit")
+            entries[idx] = entry
+        else:
+            if local:
+                metrics.incr("cache.l1.miss")
+            remote.append(idx)
+    if not remote:
+        return entries
+    try:
+        raws = await redis_client.mget([keys[idx] for idx in remote])
+    except Exception as e:
+        logger.warning("Cache read failed for %d keys: %s", len(remote), e)
+        raws = [None] * len(remote)
+    for idx, raw in zip(remote, raws):
+        entry = decode_entry(raw)
+        if entry is None:
+            metrics.incr("cache.l2.miss")
+            continue
+        metrics.incr("cache.l2.hit")
+        if local:
+            local_cache.set(keys[idx], entry, len(raw))
+        entries[idx] = entry
+    return entries
+
+
+async def cache_set(key: str, value: bytes, expire: int, tags: Iterable[str]):
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(key, value, ex=expire)
+            for tag in set(tags):
+                pipe.sadd(build_tag_key(tag), key)
+                pipe.expire(build_tag_key(tag), expire, nx=True)
+                pipe.expire(build_tag_key(tag), expire, gt=True)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning("Cache write failed for %s: %s", key, e)
+
+
+async def invalidate_tags(*tags: str):
+    tag_keys = [build_tag_key(tag) for tag in set(tags)]
+    if not tag_keys:
+        return
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            members = await pipe.execute()
+        keys = {key for group in members for key in group}
+        await redis_client.delete(*keys, *tag_keys)
+        metrics.incr("cache.invalidated_keys", len(keys))
+        decoded = [key.decode() for key in keys]
+        discard_local(decoded)
+        await publish_invalidation(decoded)
+    except Exception as e:
+        logger.warning("Cache invalidation failed for %s: %s", tags, e)
+
+
+def add_invalidation_hook(hook: Callable[[Optional[List[str]]], None]):
+    _invalidation_hooks.append(hook)
+
+
+def discard_local(keys: Optional[List[str]]):
+    if keys is None:
+        local_cache.clear()
+    else:
+        for key in keys:
+            local_cache.discard(key)
+    for hook in _invalidation_hooks:
+        hook(keys)
+
+
+async def publish_invalidation(keys: List[str]):
+    if not keys:
+        return
+    try:
+        await redis_client.publish(CACHE_INVALIDATION_CHANNEL, json.dumps(keys))
+    except Exception as e:
+        logger.warning("Cache invalidation publish failed: %s", e)
+
+
+def apply_invalidation(message: dict):
+    if message.get("type") != "message":
+        return
+    try:
+        keys = json.loads(message["data"])
+    except ValueError:
+        discard_local(None)
+        return
+    discard_local(keys)
+
+
+async def listen_for_invalidations():
+    while True:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+            discard_local(None)
+            async for message in pubsub.listen():
+                apply_invalidation(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Cache invalidation listener failed: %s", e)
+            discard_local(None)
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.aclose()
+
+
+def start_cache_listener():
+    global _listener_task
+    if _listener_task is None:
+        _listener_task = asyncio.create_task(listen_for_invalidations())
+
+
+async def stop_cache_listener():
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
+
+
+def cache_stats() -> dict:
+    counters = metrics.snapshot()["counters"]
+    stats = {"l1": local_cache.stats()}
+    for tier in ("l1", "l2"):
+        hits = counters.get(f"cache.{tier}.hit", 0)
+        misses = counters.get(f"cache.{tier}.miss", 0)
+        total = hits + misses
+        stats.setdefault(tier, {})["hit_rate"] = hits / total if total else None
+    return stats
+
+
+def jittered(expire: int) -> float:
+    return expire * (1 + random.uniform(-CACHE_JITTER, CACHE_JITTER))
+
+
+def build_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def encode_entry(body: bytes, headers: dict, expire: int) -> Tuple[dict, bytes, int]:
+    soft_ttl = jittered(expire)
+    bodies = {"identity": body, **precompress(body)}
+    meta = {
+        "soft": time.time() + soft_ttl,
+        "etag": build_etag(body),
+        "headers": headers,
+        "sizes": {encoding: len(data) for encoding, data in bodies.items()},
+    }
+    value = json.dumps(meta).encode() + b"\n" + b"".join(bodies.values())
+    return {**meta, "bodies": bodies}, value, int(soft_ttl) + CACHE_STALE_TTL
+
+
+def decode_entry(raw: Optional[bytes]) -> Optional[dict]:
+    if raw is None:
+        return None
+    meta, sep, payload = raw.partition(b"\n")
+    if not sep:
+        return None
+    try:
+        entry = json.loads(meta)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict) or "sizes" not in entry or "etag" not in entry:
+        return None
+    if sum(entry["sizes"].values()) != len(payload):
+        return None
+    bodies, offset = {}, 0
+    for encoding, size in entry["sizes"].items():
+        bodies[encoding] = payload[offset : offset + size]
+        offset += size
+    entry["bodies"] = bodies
+    return entry
+
+
+async def store_entry(
+    key: str,
+    body: bytes,
+    expire: int,
+    tags: Iterable[str],
+    local: bool = False,
+    headers: Optional[dict] = None,
+) -> dict:
+    entry, value, ttl = encode_entry(body, headers or {}, expire)
+    await cache_set(key, value, ttl, tags)
+    if local:
+        local_cache.set(key, entry, len(value))
+    return entry
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or etag in (c.removeprefix("W/") for c in candidates)
+
+
+def entry_response(entry: dict, request: Optional[Request]) -> Response:
+    encodings = [e for e in entry["bodies"] if e != "identity"]
+    encoding = None
+    if request is not None and encodings:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"), encodings)
+    etag = entry["etag"]
+    headers = {**entry.get("headers", {}), "Cache-Control": CACHE_CONTROL}
+    if encodings:
+        headers["Vary"] = "Accept-Encoding"
+    if encoding is not None:
+        etag = f'{etag[:-1]}-{encoding}"'
+        headers["Content-Encoding"] = encoding
+        metrics.incr(f"cache.encoding.{encoding}")
+    headers["ETag"] = etag
+    if request is not None and etag_matches(request.headers.get("if-none-match"), etag):
+        metrics.incr("cache.not_modified")
+        headers.pop("Content-Encoding", None)
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(
+        content=entry["bodies"][encoding or "identity"],
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def with_request_param(func, wrapper):
+    signature = inspect.signature(func)
+    request_param = inspect.Parameter(
+        REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request
+    )
+    wrapper.__signature__ = signature.replace(
+        parameters=[*signature.parameters.values(), request_param]
+    )
+    return wrapper
+
+
+async def acquire_lock(key: str) -> Optional[str]:
+    token = uuid.uuid4().hex
+    try:
+        acquired = await redis_client.set(
+            f"{key}:lock", token, nx=True, px=int(CACHE_LOCK_TTL * 1000)
+        )
+    except Exception as e:
+        logger.warning("Cache lock failed for %s: %s", key, e)
+        return token
+    return token if acquired else None
+
+
+async def release_lock(key: str, token: str):
+    try:
+        await redis_client.eval(RELEASE_LOCK_SCRIPT, 1, f"{key}:lock", token)
+    except Exception as e:
+        logger.warning("Cache unlock failed for %s: %s", key, e)
+
+
+async def wait_for_entry(key: str) -> Optional[dict]:
+    deadline = time.monotonic() + CACHE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(CACHE_LOCK_POLL)
+        entry = decode_entry(await cache_get(key))
+        if entry is not None:
+            return entry
+    return None
+
+
+def tagged_cache(
+    namespace: str,
+    expire: int,
+    key: Callable[..., str],
+    tags: Callable[..., Iterable[str]],
+    model: Any = None,
+    session_kwarg: str = "db",
+    local: bool = False,
+    render: Optional[Callable[[Any], Tuple[Any, dict]]] = None,
+    resolve_model: Optional[Callable[..., Any]] = None,
+):
+    def decorator(func):
+        async def compute(cache_id: str, args, kwargs) -> dict:
+            result = await func(*args, **kwargs)
+            target = resolve_model(**kwargs) if resolve_model is not None else model
+            if target is not None:
+                data = serialize(target, result)
+            else:
+                data = jsonable_encoder(result)
+            body, headers = render(data) if render is not None else (data, {})
+            return await store_entry(
+                cache_id,
+                dump_json(body),
+                expire,
+                tags(data, **kwargs),
+                local=local,
+                headers=headers,
+            )
+
+        async def compute_on_primary(cache_id: str, args, kwargs) -> dict:
+            async with AsyncSessionLocal() as db:
+                return await compute(cache_id, args, {**kwargs, session_kwarg: db})
+
+        async def fill(cache_id: str, args, kwargs) -> dict:
+            token = await acquire_lock(cache_id)
+            if token is None:
+                metrics.incr(f"cache.{namespace}.lock_wait")
+                entry = await wait_for_entry(cache_id)
+                if entry is not None:
+                    return entry
+            try:
+                return await compute_on_primary(cache_id, args, kwargs)
+            finally:
+                if token is not None:
+                    await release_lock(cache_id, token)
+
+        async def refresh(cache_id: str, args, kwargs):
+            token = await acquire_lock(cache_id)
+            if token is None:
+                return
+            try:
+                await compute_on_primary(cache_id, args, kwargs)
+                metrics.incr(f"cache.{namespace}.refresh")
+            except Exception as e:
+                logger.exception("Cache refresh failed for %s: %s", cache_id, e)
+            finally:
+                await release_lock(cache_id, token)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            request = kwargs.pop(REQUEST_PARAM, None)
+            cache_id = build_cache_key(namespace, key(**kwargs))
+            entry = await cache_lookup(cache_id, local)
+            if entry is not None and entry["soft"] > time.time():
+                metrics.incr(f"cache.{namespace}.hit")
+            elif entry is not None:
+                metrics.incr(f"cache.{namespace}.stale")
+                flights.start(cache_id, lambda: refresh(cache_id, args, kwargs))
+            else:
+                metrics.incr(f"cache.{namespace}.miss")
+                entry = await flights.do(cache_id, lambda: fill(cache_id, args, kwargs))
+            return entry_response(entry, request)
+
+        return with_request_param(func, wrapper)
+
+    return decorator
@@ -0,0 +1,160 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from dotenv import load_dotenv
+from typing import Dict, Iterable, Optional
+import brotli
+import gzip
+import zlib
+import os
+
+load_dotenv()
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+CACHE_GZIP_LEVEL = int(os.getenv("CACHE_GZIP_LEVEL", "9"))
+CACHE_BROTLI_QUALITY = int(os.getenv("CACHE_BROTLI_QUALITY", "9"))
+
+ENCODINGS = ("br", "gzip")
+EXCLUDED_CONTENT_TYPES = ("text/event-stream",)
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate_encoding(
+    accept_encoding: Optional[str], available: Iterable[str] = ENCODINGS
+) -> Optional[str]:
+    accepted = accepted_encodings(accept_encoding)
+    best, best_quality = None, 0.0
+    for coding in available:
+        quality = accepted.get(coding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, cached: bool = False) -> bytes:
+    if encoding == "br":
+        quality = CACHE_BROTLI_QUALITY if cached else BROTLI_QUALITY
+        return brotli.compress(body, quality=quality)
+    level = CACHE_GZIP_LEVEL if cached else GZIP_LEVEL
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def precompress(body: bytes) -> Dict[str, bytes]:
+    if len(body) < COMPRESSION_MIN_SIZE:
+        return {}
+    return {encoding: compress(body, encoding, cached=True) for encoding in ENCODINGS}
+
+
+class StreamCompressor:
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self.compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self.compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def write(self, body: bytes, more_body: bool) -> bytes:
+        if self.encoding == "br":
+            data = self.compressor.process(body)
+            return data + (
+                self.compressor.flush() if more_body else self.compressor.finish()
+            )
+        data = self.compressor.compress(body)
+        return data + self.compressor.flush(
+            zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH
+        )
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = CompressionResponder(encoding, self.minimum_size, send)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    def __init__(self, encoding: str, minimum_size: int, send: Send):
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.downstream = send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[StreamCompressor] = None
+        self.passthrough = False
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.start_message = message
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] < 200
+                or message["status"] in (204, 304)
+                or headers.get("content-type", "").startswith(EXCLUDED_CONTENT_TYPES)
+            )
+            return
+        if message["type"] != "http.response.body":
+            await self.flush_start()
+            await self.downstream(message)
+            return
+        if self.passthrough:
+            await self.flush_start()
+            await self.downstream(message)
+            return
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is None and self.start_message is not None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self.flush_start()
+                await self.downstream(message)
+                return
+            headers.add_vary_header("Accept-Encoding")
+            headers["Content-Encoding"] = self.encoding
+            if more_body:
+                del headers["Content-Length"]
+                self.compressor = StreamCompressor(self.encoding)
+            else:
+                body = compress(body, self.encoding)
+                headers["Content-Length"] = str(len(body))
+                await self.flush_start()
+                await self.downstream({**message, "body": body})
+                return
+            await self.flush_start()
+        await self.downstream(
+            {**message, "body": self.compressor.write(body, more_body)}
+        )
+
+    async def flush_start(self):
+        if self.start_message is not None:
+            await self.downstream(self.start_message)
+            self.start_message = None
@@ -0,0 +1,35 @@
+from collections import defaultdict
+import threading
+
+_lock = threading.Lock()
+_counters: dict[str, float] = defaultdict(float)
+_timings: dict[str, dict[str, float]] = {}
+
+
+def incr(name: str, value: float = 1) -> None:
+    with _lock:
+        _counters[name] += value
+
+
+def observe(name: str, value: float) -> None:
+    with _lock:
+        stats = _timings.get(name)
+        if stats is None:
+            _timings[name] = {"count": 1, "total": value, "max": value}
+            return
+        stats["count"] += 1
+        stats["total"] += value
+        stats["max"] = max(stats["max"], value)
+
+
+def snapshot() -> dict:
+    with _lock:
+        timings = {
+            name: {
+                "count": int(stats["count"]),
+                "avg": stats["total"] / stats["count"],
+                "max": stats["max"],
+            }
+            for name, stats in _timings.items()
+        }
+        return {"counters": dict(_counters), "timings": timings}
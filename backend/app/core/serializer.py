@@ -0,0 +1,105 @@
+from fastapi import Response
+from pydantic import BaseModel
+from decimal import Decimal
+from functools import lru_cache, partial
+from types import UnionType
+from typing import Annotated, Any, Callable, Mapping, Optional, Union
+from typing import get_args, get_origin
+import orjson
+
+MISSING = object()
+SEQUENCE_TYPES = (list, tuple, set, frozenset)
+
+
+def identity(value: Any) -> Any:
+    return value
+
+
+def json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dump_json(data: Any) -> bytes:
+    return orjson.dumps(data, default=json_default, option=orjson.OPT_UTC_Z)
+
+
+def optional_serializer(item: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    return lambda value: None if value is None else item(value)
+
+
+def model_serializer(model: type[BaseModel]) -> Callable[[Any], Any]:
+    fields = [
+        (
+            name,
+            field.serialization_alias or field.alias or name,
+            build_serializer(field.annotation),
+            field,
+        )
+        for name, field in model.model_fields.items()
+    ]
+
+    def serialize_model(obj: Any) -> dict:
+        get = obj.get if isinstance(obj, Mapping) else partial(getattr, obj)
+        data = {}
+        for name, alias, item, field in fields:
+            value = get(name, MISSING)
+            if value is MISSING:
+                value = field.get_default(call_default_factory=True)
+            data[alias] = value if item is identity else item(value)
+        return data
+
+    return serialize_model
+
+
+@lru_cache(maxsize=None)
+def build_serializer(annotation: Any) -> Callable[[Any], Any]:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return optional_serializer(model_serializer(annotation))
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is Annotated:
+        return build_serializer(args[0])
+    if origin in (Union, UnionType):
+        inner = [arg for arg in args if arg is not type(None)]
+        if len(inner) != 1:
+            return identity
+        item = build_serializer(inner[0])
+        return identity if item is identity else optional_serializer(item)
+    if origin in SEQUENCE_TYPES and args:
+        item = build_serializer(args[0])
+        if item is identity:
+            return identity
+        return optional_serializer(lambda values: [item(v) for v in values])
+    if origin is dict and len(args) == 2:
+        item = build_serializer(args[1])
+        if item is identity:
+            return identity
+        return optional_serializer(
+            lambda values: {k: item(v) for k, v in values.items()}
+        )
+    return identity
+
+
+def serialize(model: Any, content: Any) -> Any:
+    return build_serializer(model)(content)
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        model: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        self.serializer = build_serializer(model)
+        super().__init__(content, status_code, headers)
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(self.serializer(content))
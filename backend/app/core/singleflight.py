@@ -0,0 +1,23 @@
+from typing import Any, Awaitable, Callable, Hashable
+import asyncio
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def start(
+        self, key: Hashable, func: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Future:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return task
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        return await asyncio.shield(self.start(key, func))
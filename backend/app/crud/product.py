@@ -1,8 +1,10 @@
 from app.db.session import AsyncSession
-from typing import Optional
-from sqlalchemy.orm import selectinload
+from typing import Optional, List
+from sqlalchemy import delete, update
 from sqlalchemy.future import select
-from app.db.models.product import Product
+from app.db.models.product import Product, ProductImage, ProductVariant
+from app.db.models.order import OrderItem
+from app.utils.filters import product_detail_options
 
 
 async def get_product(
@@ -10,10 +12,7 @@ async def get_product(
     product_id: Optional[int] = None,
     product_slug: Optional[int] = None,
 ) -> Optional[Product]:
-    query = select(Product).options(
-        selectinload(Product.materials),
-        selectinload(Product.images),
-    )
+    query = select(Product).options(*product_detail_options())
     if product_id is not None:
         query = query.where(Product.id == product_id)
     elif product_slug is not None:
@@ -22,3 +21,30 @@ async def get_product(
         return None
     result = await db.execute(query)
     return result.scalars().first()
+
+
+async def delete_products(db: AsyncSession, product_ids: List[int]) -> List[str]:
+    result = await db.execute(
+        select(ProductImage.image_url, ProductImage.variants).where(
+            ProductImage.product_id.in_(product_ids)
+        )
+    )
+    image_urls = []
+    for image_url, variants in result.all():
+        image_urls.append(image_url)
+        image_urls.extend(v["image_url"] for v in variants or [])
+    variant_ids = select(ProductVariant.id).where(
+        ProductVariant.product_id.in_(product_ids)
+    )
+    await db.execute(
+        update(OrderItem)
+        .where(OrderItem.variant_id.in_(variant_ids))
+        .values(variant_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        delete(Product)
+        .where(Product.id.in_(product_ids))
+        .execution_options(synchronize_session=False)
+    )
+    return image_urls
@@ -1,4 +1,4 @@
-from app.security.hash import hash_password
+from app.security.hash import hash_password_async
 from app.db.models.user import User
 from app.db.session import AsyncSession
 from sqlalchemy.future import select
@@ -14,7 +14,7 @@ async def create_user(
     is_verified: bool,
     password: Optional[str] = None,
 ) -> User:
-    hashed_password = hash_password(password) if password else None
+    hashed_password = await hash_password_async(password) if password else None
     new_user = User(
         name=name,
         email=email,
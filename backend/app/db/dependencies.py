@@ -1,8 +1,63 @@
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import AsyncSessionLocal
+from app.db.session import AsyncSessionLocal, AsyncReadSessionLocal, read_engine, engine
+from app.core.redis import redis_client
+from app.core import metrics
+from dotenv import load_dotenv
+import logging
+import time
+import os
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+READ_AFTER_WRITE_WINDOW = float(os.getenv("DB_READ_AFTER_WRITE_WINDOW", "5"))
+PRIMARY_WRITE_KEY = "db:primary-write"
+_primary_until = 0.0
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def mark_primary_write() -> None:
+    global _primary_until
+    if read_engine is engine:
+        return
+    _primary_until = time.monotonic() + READ_AFTER_WRITE_WINDOW
+    try:
+        await redis_client.set(
+            PRIMARY_WRITE_KEY, 1, px=int(READ_AFTER_WRITE_WINDOW * 1000)
+        )
+    except Exception as e:
+        logger.warning("Failed to publish primary write marker: %s", e)
+
+
+async def should_read_primary() -> bool:
+    global _primary_until
+    if read_engine is engine:
+        return True
+    now = time.monotonic()
+    if now < _primary_until:
+        return True
+    try:
+        ttl = await redis_client.pttl(PRIMARY_WRITE_KEY)
+    except Exception as e:
+        logger.warning("Failed to read primary write marker: %s", e)
+        return True
+    if ttl > 0:
+        _primary_until = now + ttl / 1000
+        return True
+    return False
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    if await should_read_primary():
+        metrics.incr("db.read.primary")
+        session_factory = AsyncSessionLocal
+    else:
+        metrics.incr("db.read.replica")
+        session_factory = AsyncReadSessionLocal
+    async with session_factory() as session:
+        yield session
@@ -0,0 +1,119 @@
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from app.db.models.product import Product, ProductVariant, ProductMaterial
+from app.utils.search import SEARCH_FIELDS, product_search_document
+from typing import Iterable, Set
+
+PRICE_FIELDS = ("regular_price", "discount_price", "product_id")
+
+
+def variant_price(aggregate):
+    return (
+        select(aggregate)
+        .where(ProductVariant.product_id == Product.id)
+        .scalar_subquery()
+    )
+
+
+def product_price_update(product_ids: Iterable[int]):
+    effective_price = func.coalesce(
+        func.nullif(ProductVariant.discount_price, 0), ProductVariant.regular_price
+    )
+    return (
+        update(Product)
+        .where(Product.id.in_(list(product_ids)))
+        .values(
+            min_price=variant_price(func.min(ProductVariant.regular_price)),
+            max_price=variant_price(func.max(ProductVariant.regular_price)),
+            effective_min_price=variant_price(func.min(effective_price)),
+            updated_at=Product.updated_at,
+        )
+        .returning(
+            Product.id,
+            Product.min_price,
+            Product.max_price,
+            Product.effective_min_price,
+        )
+    )
+
+
+def changed_variant_products(session: Session) -> Set[int]:
+    product_ids = set()
+    for variant in session.new:
+        if isinstance(variant, ProductVariant) and variant.product_id is not None:
+            product_ids.add(variant.product_id)
+    for variant in session.deleted:
+        if isinstance(variant, ProductVariant) and variant.product_id is not None:
+            product_ids.add(variant.product_id)
+    for variant in session.dirty:
+        if not isinstance(variant, ProductVariant):
+            continue
+        state = inspect(variant)
+        for field in PRICE_FIELDS:
+            history = state.attrs[field].history
+            if not history.has_changes():
+                continue
+            product_ids.add(variant.product_id)
+            if field == "product_id":
+                product_ids.update(pid for pid in history.deleted if pid is not None)
+    return product_ids
+
+
+def changed_search_products(session: Session) -> Set[int]:
+    product_ids = set()
+    for obj in session.new:
+        if isinstance(obj, Product):
+            product_ids.add(obj.id)
+        elif isinstance(obj, ProductMaterial) and obj.product_id is not None:
+            product_ids.add(obj.product_id)
+    for obj in session.deleted:
+        if isinstance(obj, ProductMaterial) and obj.product_id is not None:
+            product_ids.add(obj.product_id)
+    for obj in session.dirty:
+        if isinstance(obj, ProductMaterial):
+            if inspect(obj).attrs["material"].history.has_changes():
+                product_ids.add(obj.product_id)
+        elif isinstance(obj, Product):
+            state = inspect(obj)
+            if any(state.attrs[f].history.has_changes() for f in SEARCH_FIELDS):
+                product_ids.add(obj.id)
+    return product_ids
+
+
+def product_search_update(product_ids: Iterable[int]):
+    return (
+        update(Product)
+        .where(Product.id.in_(list(product_ids)))
+        .values(search_vector=product_search_document(), updated_at=Product.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def sync_product_search(session: Session, flush_context) -> None:
+    product_ids = changed_search_products(session) - {
+        obj.id for obj in session.deleted if isinstance(obj, Product)
+    }
+    if product_ids:
+        session.connection().execute(product_search_update(product_ids))
+
+
+def sync_product_prices(session: Session, flush_context) -> None:
+    product_ids = changed_variant_products(session)
+    if not product_ids:
+        return
+    result = session.connection().execute(product_price_update(product_ids))
+    for product_id, min_price, max_price, effective_min_price in result:
+        product = session.identity_map.get(session.identity_key(Product, product_id))
+        if product is None:
+            continue
+        set_committed_value(product, "min_price", min_price)
+        set_committed_value(product, "max_price", max_price)
+        set_committed_value(product, "effective_min_price", effective_min_price)
+
+
+def register_model_events() -> None:
+    if not event.contains(Session, "after_flush", sync_product_prices):
+        event.listen(Session, "after_flush", sync_product_prices)
+    if not event.contains(Session, "after_flush", sync_product_search):
+        event.listen(Session, "after_flush", sync_product_search)
@@ -1,13 +1,99 @@
 import asyncio
+from sqlalchemy import select, text
 from app.db.base import Base
 from app.db.session import engine
 from app.db import models
+from app.db.events import product_price_update, product_search_update
+from app.db.models.product import Product
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+
+BACKFILL_BATCH_SIZE = int(os.getenv("BACKFILL_BATCH_SIZE", "1000"))
+
+PRODUCT_PRICE_MIGRATION = (
+    "ALTER TABLE product ADD COLUMN IF NOT EXISTS min_price numeric(10, 2), "
+    "ADD COLUMN IF NOT EXISTS max_price numeric(10, 2), "
+    "ADD COLUMN IF NOT EXISTS effective_min_price numeric(10, 2)",
+    "ALTER TABLE product ALTER COLUMN min_price DROP NOT NULL, "
+    "ALTER COLUMN min_price DROP DEFAULT, "
+    "ALTER COLUMN max_price DROP NOT NULL, "
+    "ALTER COLUMN max_price DROP DEFAULT, "
+    "ALTER COLUMN effective_min_price DROP NOT NULL, "
+    "ALTER COLUMN effective_min_price DROP DEFAULT",
+    "DROP INDEX IF EXISTS ix_product_min_price_id",
+    "DROP INDEX IF EXISTS ix_product_max_price",
+)
 
 
 async def create_table():
     async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
 
 
+PRODUCT_SEARCH_MIGRATION = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE product ADD COLUMN IF NOT EXISTS search_vector tsvector",
+)
+
+
+def product_index(name: str):
+    return next(i for i in Product.__table__.indexes if i.name == name)
+
+
+async def create_product_index(conn, name: str):
+    await conn.run_sync(lambda sync: product_index(name).create(sync, checkfirst=True))
+
+
+async def backfill_products(statement_for_ids, batch_size: int = BACKFILL_BATCH_SIZE):
+    last_id, updated = 0, 0
+    while True:
+        async with engine.begin() as conn:
+            ids = (
+                (
+                    await conn.execute(
+                        select(Product.id)
+                        .where(Product.id > last_id)
+                        .order_by(Product.id)
+                        .limit(batch_size)
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            if not ids:
+                return updated
+            await conn.execute(statement_for_ids(ids))
+        last_id = ids[-1]
+        updated += len(ids)
+
+
+async def migrate_product_prices():
+    async with engine.begin() as conn:
+        for statement in PRODUCT_PRICE_MIGRATION:
+            await conn.execute(text(statement))
+        definition = await conn.scalar(
+            text(
+                "SELECT indexdef FROM pg_indexes "
+                "WHERE indexname = 'ix_product_effective_min_price_id'"
+            )
+        )
+        if definition and "coalesce" not in definition.lower():
+            await conn.execute(text("DROP INDEX ix_product_effective_min_price_id"))
+        await create_product_index(conn, "ix_product_effective_min_price_id")
+    return await backfill_products(product_price_update)
+
+
+async def migrate_product_search():
+    async with engine.begin() as conn:
+        for statement in PRODUCT_SEARCH_MIGRATION:
+            await conn.execute(text(statement))
+        await create_product_index(conn, "ix_product_search_vector")
+        await create_product_index(conn, "ix_product_name_trgm")
+    return await backfill_products(product_search_update)
+
+
 if __name__ == "__main__":
     asyncio.run(create_table())
@@ -14,6 +14,9 @@ from app.db.models.product import (
 )
 from app.db.models.order import Order, OrderItem
 from app.db.models.blog import Blog
+from app.db.events import register_model_events
+
+register_model_events()
 
 __all__ = [
     "User",
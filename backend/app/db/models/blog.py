@@ -1,7 +1,17 @@
 from app.db.base import Base
 from datetime import datetime
+from typing import Optional
 from sqlalchemy.orm import mapped_column, Mapped, relationship
-from sqlalchemy import String, DateTime, func, Text, ForeignKey, Integer
+from sqlalchemy import (
+    String,
+    DateTime,
+    func,
+    Text,
+    ForeignKey,
+    Integer,
+    JSON,
+    Index,
+)
 
 
 class Blog(Base):
@@ -23,12 +33,13 @@ class Blog(Base):
         lazy="selectin",
     )
 
+    __table_args__ = (Index("ix_blog_date_id", "date", "id"),)
+
 
 class BlogImage(Base):
     __tablename__ = "blog_images"
     id: Mapped[int] = mapped_column(primary_key=True)
     image_url: Mapped[str] = mapped_column(String(255), nullable=False)
+    variants: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
     blog_id: Mapped[int] = mapped_column(Integer, ForeignKey("blog.id"), nullable=False)
-    blog: Mapped["Blog"] = relationship(
-        "Blog", back_populates="images", lazy="selectin"
-    )
+    blog: Mapped["Blog"] = relationship("Blog", back_populates="images")
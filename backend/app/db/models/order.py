@@ -1,7 +1,7 @@
 from datetime import datetime
 from app.db.base import Base
 from sqlalchemy.orm import mapped_column, Mapped, relationship
-from sqlalchemy import Integer, ForeignKey, Numeric, DateTime, func, Enum, String
+from sqlalchemy import Integer, ForeignKey, Numeric, DateTime, func, Enum, String, Index
 from app.db.models.user import User, UserAddress
 from typing import TYPE_CHECKING
 from enum import StrEnum
@@ -59,6 +59,10 @@ class Order(Base):
     snap_token: Mapped[str] = mapped_column(String(255), nullable=True)
     snap_redirect_url: Mapped[str] = mapped_column(String(255), nullable=True)
 
+    __table_args__ = (
+        Index("ix_orders_user_created_at_id", "user_id", "created_at", "id"),
+    )
+
 
 class OrderItem(Base):
     __tablename__ = "order_items"
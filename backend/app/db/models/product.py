@@ -3,6 +3,7 @@ from decimal import Decimal
 from app.db.base import Base
 from datetime import datetime
 from sqlalchemy.orm import mapped_column, Mapped, relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from app.db.models.order import OrderItem
 from sqlalchemy import (
     String,
@@ -14,6 +15,9 @@ from sqlalchemy import (
     Text,
     Numeric,
     UniqueConstraint,
+    JSON,
+    Index,
+    text,
 )
 
 
@@ -46,7 +50,8 @@ class Product(Base):
         "Wishlist",
         back_populates="product",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise",
+        passive_deletes=True,
     )
     category: Mapped[str] = mapped_column(String(255), nullable=False)
     product_summary: Mapped[str] = mapped_column(Text, nullable=False)
@@ -65,6 +70,38 @@ class Product(Base):
         onupdate=func.now(),
     )
     is_active: Mapped[bool] = mapped_column(Boolean(), default=True, nullable=False)
+    min_price: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 2), nullable=True)
+    max_price: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 2), nullable=True)
+    effective_min_price: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(10, 2), nullable=True
+    )
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, nullable=True, deferred=True
+    )
+
+    __table_args__ = (
+        Index("ix_product_created_at_id", "created_at", "id"),
+        Index(
+            "ix_product_effective_min_price_id",
+            text("coalesce(effective_min_price, 0)"),
+            "id",
+        ),
+        Index("ix_product_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_product_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index("ix_product_name_id", "name", "id"),
+        Index("ix_product_category_created_at_id", "category", "created_at", "id"),
+    )
+
+    @property
+    def cover_image(self) -> Optional["ProductImage"]:
+        if not self.images:
+            return None
+        return min(self.images, key=lambda i: (i.position or 0, i.id))
 
 
 class ProductMaterial(Base):
@@ -74,9 +111,7 @@ class ProductMaterial(Base):
     product_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("product.id", ondelete="CASCADE")
     )
-    product: Mapped["Product"] = relationship(
-        "Product", back_populates="materials", lazy="selectin"
-    )
+    product: Mapped["Product"] = relationship("Product", back_populates="materials")
 
 
 class ProductVariant(Base):
@@ -99,12 +134,13 @@ class ProductVariant(Base):
         "CartItem",
         back_populates="variant",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise",
+        passive_deletes=True,
     )
     order_items: Mapped[list["OrderItem"]] = relationship(
         "OrderItem",
         back_populates="variant",
-        lazy="selectin",
+        lazy="select",
     )
 
 
@@ -112,13 +148,12 @@ class ProductImage(Base):
     __tablename__ = "product_image"
     id: Mapped[int] = mapped_column(primary_key=True)
     image_url: Mapped[str] = mapped_column(String(255), nullable=False)
+    variants: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
     position: Mapped[int] = mapped_column(Integer, default=0)
     product_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("product.id", ondelete="CASCADE"), nullable=False
     )
-    product: Mapped["Product"] = relationship(
-        "Product", back_populates="images", lazy="selectin"
-    )
+    product: Mapped["Product"] = relationship("Product", back_populates="images")
 
 
 class Cart(Base):
@@ -137,7 +172,11 @@ class Cart(Base):
         onupdate=func.now(),
     )
     cart_items: Mapped[list["CartItem"]] = relationship(
-        "CartItem", back_populates="cart", cascade="all, delete-orphan", lazy="selectin"
+        "CartItem",
+        back_populates="cart",
+        cascade="all, delete-orphan",
+        lazy="raise",
+        passive_deletes=True,
     )
 
 
@@ -154,9 +193,7 @@ class CartItem(Base):
     variant: Mapped["ProductVariant"] = relationship(
         "ProductVariant", back_populates="cart_items", lazy="selectin"
     )
-    cart: Mapped["Cart"] = relationship(
-        "Cart", back_populates="cart_items", lazy="selectin"
-    )
+    cart: Mapped["Cart"] = relationship("Cart", back_populates="cart_items")
 
     @property
     def price(self) -> Decimal:
@@ -190,3 +227,7 @@ class Wishlist(Base):
     product: Mapped["Product"] = relationship(
         "Product", back_populates="wishlist", lazy="selectin"
     )
+
+    __table_args__ = (
+        Index("ix_wishlist_user_created_at_id", "user_id", "created_at", "id"),
+    )
@@ -10,6 +10,7 @@ from sqlalchemy import (
     Boolean,
     ForeignKey,
     func,
+    Index,
 )
 from typing import TYPE_CHECKING
 
@@ -48,16 +49,18 @@ class User(Base):
         "Order",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="select",
     )
     password_reset_token: Mapped["UserPasswordResetToken"] = relationship(
         "UserPasswordResetToken",
         back_populates="user",
         uselist=False,
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="select",
     )
 
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"),)
+
 
 class UserAddress(Base):
     __tablename__ = "user_addresses"
@@ -75,11 +78,9 @@ class UserAddress(Base):
         "Order",
         back_populates="address",
         cascade="all, delete-orphan",
-        lazy="selectin",
-    )
-    user: Mapped["User"] = relationship(
-        "User", back_populates="addresses", lazy="selectin"
+        lazy="select",
     )
+    user: Mapped["User"] = relationship("User", back_populates="addresses")
 
 
 class UserPasswordResetToken(Base):
@@ -91,6 +92,4 @@ class UserPasswordResetToken(Base):
     token: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     expires_at: Mapped[str] = mapped_column(DateTime(), nullable=False)
     used: Mapped[bool] = mapped_column(Boolean, default=False)
-    user: Mapped["User"] = relationship(
-        "User", back_populates="password_reset_token", lazy="selectin"
-    )
+    user: Mapped["User"] = relationship("User", back_populates="password_reset_token")
@@ -1,21 +1,51 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query, UploadFile, File
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    status,
+    Depends,
+    Query,
+    UploadFile,
+    File,
+    BackgroundTasks,
+)
 from app.db.session import AsyncSession
 from app.db.models.blog import Blog, BlogImage
-from app.db.models.user import User
+from app.schemas.user import UserPrincipal
 from app.security.jwt import get_admin_user
-from app.schemas.blog import BlogCreate, BlogOut, BlogUpdate, BlogImageOut
-from app.db.dependencies import get_db
+from app.schemas.blog import (
+    BlogCreate,
+    BlogOut,
+    BlogUpdate,
+    BlogImageOut,
+    BlogListPage,
+)
+from app.db.dependencies import get_db, mark_primary_write
 from app.utils.sanitize import sanitize_html
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from app.security.r2_config import CLOUDFLARE_BUCKET_NAME_1
 from app.utils.r2_service import (
     upload_product_images,
-    R2_PUBLIC_URL,
-    delete_image_from_r2,
+    delete_images_from_r2,
+    extract_r2_key,
+    create_presigned_uploads,
+    confirm_uploaded_keys,
 )
+from app.schemas.image import PresignedUploadRequest, PresignedUploadOut, UploadConfirm
+from app.utils.image_service import process_blog_images, variant_keys
 from app.utils.slug import get_blog_slug
-from fastapi_cache.decorator import cache
-from fastapi_cache import FastAPICache
+from app.utils.pagination import (
+    apply_keyset_page,
+    split_keyset_page,
+)
+from typing import Optional
+from app.core.cache import tagged_cache
+from app.utils.catalog_cache import (
+    invalidate_blogs,
+    blog_page_tags,
+    blog_detail_tags,
+    render_blog_page,
+)
 
 router = APIRouter(prefix="/api/blog")
 
@@ -24,7 +54,7 @@ router = APIRouter(prefix="/api/blog")
 async def api_blog_add(
     data: BlogCreate,
     db: AsyncSession = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+    admin: UserPrincipal = Depends(get_admin_user),
 ):
     sanitize_content = sanitize_html(data.content)
     payload = data.model_dump()
@@ -33,8 +63,9 @@ async def api_blog_add(
     new_blog = Blog(**payload)
     db.add(new_blog)
     await db.commit()
+    await mark_primary_write()
     await db.refresh(new_blog)
-    await FastAPICache.clear(namespace="blog:all")
+    await invalidate_blogs(listing=True)
     return new_blog
 
 
@@ -45,8 +76,9 @@ async def api_blog_add(
 )
 async def api_blog_add_images(
     blog_id: int,
+    background_tasks: BackgroundTasks,
     files: list[UploadFile] = File(...),
-    admin: User = Depends(get_admin_user),
+    admin: UserPrincipal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     blog = await db.get(Blog, blog_id)
@@ -66,9 +98,71 @@ async def api_blog_add_images(
     ]
     db.add_all(blog_images)
     await db.commit()
+    await mark_primary_write()
     for img in blog_images:
         await db.refresh(img)
-    await FastAPICache.clear(namespace="blog:all")
+    background_tasks.add_task(process_blog_images, [img.id for img in blog_images])
+    await invalidate_blogs([blog_id])
+    return blog_images
+
+
+@router.post(
+    "/{blog_id}/images/presign",
+    response_model=list[PresignedUploadOut],
+    status_code=status.HTTP_200_OK,
+)
+async def api_blog_presign_images(
+    blog_id: int,
+    data: PresignedUploadRequest,
+    admin: UserPrincipal = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db),
+):
+    exists = await db.scalar(select(Blog.id).where(Blog.id == blog_id))
+    if not exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Blog post not found."
+        )
+    return create_presigned_uploads(
+        data.files, bucket=CLOUDFLARE_BUCKET_NAME_1, folder=f"blogs/{blog_id}"
+    )
+
+
+@router.post(
+    "/{blog_id}/images/confirm",
+    response_model=list[BlogImageOut],
+    status_code=status.HTTP_201_CREATED,
+)
+async def api_blog_confirm_images(
+    blog_id: int,
+    data: UploadConfirm,
+    background_tasks: BackgroundTasks,
+    admin: UserPrincipal = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db),
+):
+    exists = await db.scalar(select(Blog.id).where(Blog.id == blog_id))
+    if not exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Blog post not found."
+        )
+    image_urls = await confirm_uploaded_keys(
+        data.keys, bucket=CLOUDFLARE_BUCKET_NAME_1, folder=f"blogs/{blog_id}"
+    )
+    confirmed = await db.scalar(
+        select(BlogImage.id).where(BlogImage.image_url.in_(image_urls)).limit(1)
+    )
+    if confirmed:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Some uploads are already confirmed.",
+        )
+    blog_images = [BlogImage(blog_id=blog_id, image_url=url) for url in image_urls]
+    db.add_all(blog_images)
+    await db.commit()
+    await mark_primary_write()
+    for img in blog_images:
+        await db.refresh(img)
+    background_tasks.add_task(process_blog_images, [img.id for img in blog_images])
+    await invalidate_blogs([blog_id])
     return blog_images
 
 
@@ -77,7 +171,8 @@ async def api_blog_add_images(
 )
 async def api_blog_delete_image(
     image_id: int,
-    admin: User = Depends(get_admin_user),
+    background_tasks: BackgroundTasks,
+    admin: UserPrincipal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(BlogImage).where(BlogImage.id == image_id))
@@ -86,12 +181,13 @@ async def api_blog_delete_image(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Image not found"
         )
-    key = image.image_url.replace(f"{R2_PUBLIC_URL}/", "")
-    delete_image_from_r2(key)
+    keys = [extract_r2_key(image.image_url), *variant_keys(image.variants)]
+    blog_id = image.blog_id
     await db.delete(image)
     await db.commit()
-    await FastAPICache.clear(namespace="blog:all")
-    await FastAPICache.clear(namespace="blog:single")
+    await mark_primary_write()
+    background_tasks.add_task(delete_images_from_r2, keys)
+    await invalidate_blogs([blog_id])
 
 
 @router.patch(
@@ -101,7 +197,7 @@ async def api_blog_update(
     blog_id: int,
     data: BlogUpdate,
     db: AsyncSession = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+    admin: UserPrincipal = Depends(get_admin_user),
 ):
     result = await db.get(Blog, blog_id)
     if not result:
@@ -116,9 +212,9 @@ async def api_blog_update(
     for field, value in payload.items():
         setattr(result, field, value)
     await db.commit()
+    await mark_primary_write()
     await db.refresh(result)
-    await FastAPICache.clear(namespace="blog:all")
-    await FastAPICache.clear(namespace="blog:single")
+    await invalidate_blogs([blog_id])
     return result
 
 
@@ -128,7 +224,7 @@ async def api_blog_update(
 async def api_blog_delete(
     blog_id: int,
     db: AsyncSession = Depends(get_db),
-    admin: User = Depends(get_admin_user),
+    admin: UserPrincipal = Depends(get_admin_user),
 ):
     result = await db.get(Blog, blog_id)
     if not result:
@@ -137,8 +233,8 @@ async def api_blog_delete(
         )
     await db.delete(result)
     await db.commit()
-    await FastAPICache.clear(namespace="blog:all")
-    await FastAPICache.clear(namespace="blog:single")
+    await mark_primary_write()
+    await invalidate_blogs([blog_id], listing=True)
 
 
 @router.get(
@@ -146,15 +242,18 @@ async def api_blog_delete(
     response_model=BlogOut,
     status_code=status.HTTP_200_OK,
 )
-@cache(
-    expire=43200,
+@tagged_cache(
     namespace="blog:single",
+    expire=43200,
+    key=lambda identifier, **kwargs: identifier,
+    tags=blog_detail_tags,
+    model=BlogOut,
 )
 async def api_blog_get(
     identifier: str,
     db: AsyncSession = Depends(get_db),
 ):
-    query = select(Blog)
+    query = select(Blog).options(selectinload(Blog.images))
     if identifier.isdigit():
         query = query.where(Blog.id == int(identifier))
     else:
@@ -171,20 +270,31 @@ async def api_blog_get(
 
 
 @router.get("/all", response_model=list[BlogOut], status_code=status.HTTP_200_OK)
-@cache(
-    expire=43200,
+@tagged_cache(
     namespace="blog:all",
-    key_builder=lambda func,
-    *args,
-    **kwargs: f"blog:all:limit={kwargs.get('limit')}:page={kwargs.get('page')}",
+    expire=43200,
+    key=lambda limit, page, cursor, **kwargs: f"{limit}:{page}:{cursor}",
+    tags=blog_page_tags,
+    model=BlogListPage,
+    render=render_blog_page,
 )
 async def api_blog_get_all(
     limit: int = Query(12, ge=1, le=24),
     page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Blog).order_by(Blog.date.desc()).limit(limit).offset((page - 1) * limit)
+    query = apply_keyset_page(
+        select(Blog).options(selectinload(Blog.images)),
+        [Blog.date, Blog.id],
+        True,
+        "blog",
+        cursor,
+        page,
+        limit,
+    )
+    result = await db.execute(query)
+    blogs, next_cursor = split_keyset_page(
+        result.scalars().all(), limit, "blog", lambda b: [b.date, b.id]
     )
-    blogs = result.scalars().all()
-    return blogs
+    return {"blogs": blogs, "next_cursor": next_cursor}
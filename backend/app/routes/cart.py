@@ -1,13 +1,16 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from app.db.session import AsyncSession
-from app.db.models.product import Cart, Product, CartItem, ProductVariant
-from app.db.models.user import User
+from app.db.models.product import Cart, CartItem, ProductVariant
+from app.schemas.user import UserPrincipal
 from app.crud.cart import upsert_cart_item
-from app.security.jwt import get_current_user
+from app.security.jwt import get_current_principal
 from app.schemas.product import CartOut, CartItemOut, CartItemCreate, CartItemUpdate
 from app.db.dependencies import get_db
+from app.utils.filters import product_detail_options
+from app.core.serializer import FastJSONResponse
 from sqlalchemy.orm import selectinload
 from sqlalchemy import select, delete
+from decimal import Decimal
 
 router = APIRouter(prefix="/api/cart")
 
@@ -16,7 +19,7 @@ router = APIRouter(prefix="/api/cart")
 async def api_cart_add(
     data: CartItemCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
     if data.quantity <= 0:
         raise HTTPException(
@@ -33,8 +36,7 @@ async def api_cart_add(
         select(ProductVariant)
         .where(ProductVariant.id == data.variant_id)
         .options(
-            selectinload(ProductVariant.product).selectinload(Product.images),
-            selectinload(ProductVariant.product).selectinload(Product.materials),
+            selectinload(ProductVariant.product).options(*product_detail_options())
         )
     )
     variant = variant_result.scalar_one_or_none()
@@ -55,17 +57,9 @@ async def api_cart_add(
     result = await db.execute(
         select(CartItem)
         .options(
-            selectinload(CartItem.variant),
-            selectinload(CartItem.variant).selectinload(ProductVariant.product),
             selectinload(CartItem.variant)
             .selectinload(ProductVariant.product)
-            .selectinload(Product.images),
-            selectinload(CartItem.variant)
-            .selectinload(ProductVariant.product)
-            .selectinload(Product.materials),
-            selectinload(CartItem.variant)
-            .selectinload(ProductVariant.product)
-            .selectinload(Product.variants),
+            .options(*product_detail_options()),
         )
         .where(CartItem.id == item_id)
     )
@@ -75,7 +69,8 @@ async def api_cart_add(
 
 @router.get("/get/all", response_model=CartOut, status_code=status.HTTP_200_OK)
 async def api_cart_all(
-    current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     cart = (
         await db.execute(select(Cart).where(Cart.user_id == current_user.id))
@@ -85,31 +80,26 @@ async def api_cart_all(
     result = await db.execute(
         select(CartItem)
         .options(
-            selectinload(CartItem.variant),
-            selectinload(CartItem.variant).selectinload(ProductVariant.product),
-            selectinload(CartItem.variant)
-            .selectinload(ProductVariant.product)
-            .selectinload(Product.images),
             selectinload(CartItem.variant)
             .selectinload(ProductVariant.product)
-            .selectinload(Product.materials),
-            selectinload(CartItem.variant)
-            .selectinload(ProductVariant.product)
-            .selectinload(Product.variants),
+            .options(*product_detail_options()),
         )
         .where(CartItem.cart_id == cart.id)
     )
     items = result.scalars().all()
     total_items = sum(i.quantity for i in items)
-    cart_total = sum(i.quantity * i.price for i in items)
-    return CartOut(cart_items=items, total_items=total_items, cart_total=cart_total)
+    cart_total = sum((i.quantity * i.price for i in items), Decimal(0))
+    return FastJSONResponse(
+        {"cart_items": items, "total_items": total_items, "cart_total": cart_total},
+        CartOut,
+    )
 
 
 @router.delete("/delete/{item_id}", response_model=None, status_code=status.HTTP_200_OK)
 async def api_delete_cart(
     item_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
     cart = (
         await db.execute(select(Cart).where(Cart.user_id == current_user.id))
@@ -137,7 +127,8 @@ async def api_delete_cart(
     "/delete/all", response_model=None, status_code=status.HTTP_204_NO_CONTENT
 )
 async def api_delete_all_cart(
-    current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+    current_user: UserPrincipal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
 ):
     cart = (
         await db.execute(select(Cart).where(Cart.user_id == current_user.id))
@@ -154,7 +145,7 @@ async def api_delete_all_cart(
 @router.patch("/update", response_model=CartOut)
 async def api_update_cart_item(
     data: CartItemUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     cart = await db.execute(select(Cart).where(Cart.user_id == current_user.id))
@@ -185,24 +176,21 @@ async def api_update_cart_item(
     result = await db.execute(
         select(CartItem)
         .options(
-            selectinload(CartItem.variant),
-            selectinload(CartItem.variant).selectinload(ProductVariant.product),
-            selectinload(CartItem.variant)
-            .selectinload(ProductVariant.product)
-            .selectinload(Product.images),
-            selectinload(CartItem.variant)
-            .selectinload(ProductVariant.product)
-            .selectinload(Product.materials),
             selectinload(CartItem.variant)
             .selectinload(ProductVariant.product)
-            .selectinload(Product.variants),
+            .options(*product_detail_options()),
         )
         .where(CartItem.cart_id == cart.id)
         .order_by(CartItem.id)
     )
     cart_items = result.scalars().all()
-    return CartOut(
-        cart_items=cart_items,
-        total_items=sum(item.quantity for item in cart_items),
-        cart_total=sum(item.quantity * item.price for item in cart_items),
+    return FastJSONResponse(
+        {
+            "cart_items": cart_items,
+            "total_items": sum(item.quantity for item in cart_items),
+            "cart_total": sum(
+                (item.quantity * item.price for item in cart_items), Decimal(0)
+            ),
+        },
+        CartOut,
     )
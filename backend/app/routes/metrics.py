@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, status
+from app.schemas.user import UserPrincipal
+from app.db.session import engine, read_engine, pool_status
+from app.security.jwt import get_admin_user
+from app.core import metrics
+from app.core.cache import cache_stats
+
+router = APIRouter(prefix="/api/metrics")
+
+
+@router.get("", status_code=status.HTTP_200_OK)
+async def api_metrics(admin: UserPrincipal = Depends(get_admin_user)):
+    data = metrics.snapshot()
+    data["db_pool"] = {"primary": pool_status(engine)}
+    if read_engine is not engine:
+        data["db_pool"]["replica"] = pool_status(read_engine)
+    data["cache"] = cache_stats()
+    return data
@@ -1,15 +1,24 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Query
-from app.db.models.user import User, UserAddress
-from app.security.jwt import get_current_user
+from app.db.models.user import UserAddress
+from app.schemas.user import UserPrincipal
+from app.security.jwt import get_current_principal
 from app.utils.midtrans import create_midtrans_transaction
 from app.db.session import AsyncSession
-from app.db.dependencies import get_db
+from app.db.dependencies import get_db, mark_primary_write
 from sqlalchemy.orm import selectinload
 from sqlalchemy import select, update
 from app.db.models.order import Order, OrderStatus, OrderItem
 from app.schemas.order import OrderOut, OrderCreate
 from app.db.models.product import Product, ProductVariant
+from app.utils.pagination import (
+    apply_keyset_page,
+    split_keyset_page,
+    NEXT_CURSOR_HEADER,
+)
+from app.utils.catalog_cache import invalidate_products
+from app.core.serializer import FastJSONResponse
 from decimal import Decimal
+from typing import Optional
 
 router = APIRouter(prefix="/api/orders")
 
@@ -17,7 +26,7 @@ router = APIRouter(prefix="/api/orders")
 @router.post("/create", status_code=status.HTTP_200_OK, response_model=OrderOut)
 async def api_order_create(
     payload: OrderCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     addr = await db.get(UserAddress, payload.address_id)
@@ -84,14 +93,26 @@ async def api_order_create(
         )
 
     await db.commit()
-    await db.refresh(order)
+    await mark_primary_write()
+    await invalidate_products({variant.product_id for variant, _ in variants})
+    result = await db.execute(
+        select(Order)
+        .where(Order.id == order.id)
+        .options(
+            selectinload(Order.user),
+            selectinload(Order.address),
+            selectinload(Order.items),
+        )
+        .execution_options(populate_existing=True)
+    )
+    order = result.scalar_one()
     return OrderOut.model_validate(order)
 
 
 @router.post("/{order_id}/pay", status_code=status.HTTP_200_OK)
 async def api_order_pay(
     order_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(
@@ -119,30 +140,37 @@ async def api_order_pay(
 
 @router.get("/me", response_model=list[OrderOut], status_code=status.HTTP_200_OK)
 async def api_get_my_orders(
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
     page: int = Query(1, ge=1),
     limit: int = Query(24, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
 ):
     query = (
         select(Order)
         .where(Order.user_id == current_user.id)
-        .order_by(Order.created_at.desc())
         .options(
+            selectinload(Order.user),
             selectinload(Order.address),
             selectinload(Order.items),
             selectinload(Order.items).selectinload(OrderItem.variant),
         )
     )
-    result = await db.execute(query.offset((page - 1) * limit).limit(limit))
-    orders = result.scalars().all()
-    return [OrderOut.model_validate(order) for order in orders]
+    query = apply_keyset_page(
+        query, [Order.created_at, Order.id], True, "orders", cursor, page, limit
+    )
+    result = await db.execute(query)
+    orders, next_cursor = split_keyset_page(
+        result.scalars().all(), limit, "orders", lambda o: [o.created_at, o.id]
+    )
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return FastJSONResponse(orders, list[OrderOut], headers=headers)
 
 
 @router.get("/{order_id}", response_model=OrderOut, status_code=status.HTTP_200_OK)
 async def api_get_order_detail(
     order_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(
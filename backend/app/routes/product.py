@@ -1,32 +1,77 @@
 from app.db.models.product import ProductImage, ProductMaterial, ProductVariant
-from typing import List
-from fastapi import APIRouter, HTTPException, status, Depends, Query, UploadFile, File
+from typing import List, Optional, Union
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    status,
+    Depends,
+    Query,
+    UploadFile,
+    File,
+    BackgroundTasks,
+    Response,
+)
 from app.schemas.product import (
     ProductDataOut,
     ProductListResponse,
+    ProductCardListResponse,
     ProductDataBase,
     ProductDeleteMany,
     ProductListFilters,
     ProductImageOut,
     ProductUpdate,
+    ProductSuggestOut,
+    ProductBatchRequest,
 )
-from app.db.models.user import User
+from app.schemas.user import UserPrincipal
 from app.security.jwt import get_admin_user
 from app.db.session import AsyncSession
-from app.db.dependencies import get_db
+from app.db.dependencies import get_db, mark_primary_write
 from app.db.models import Product
 from app.utils.slug import get_product_slug, get_sku
-from app.crud.product import get_product
-from sqlalchemy import select, func
-from app.utils.filters import apply_product_filters, get_base_product_query
+from app.crud.product import get_product, delete_products
+from sqlalchemy import select
+from app.utils.filters import (
+    get_base_product_query,
+    get_product_card_query,
+    product_sort_name,
+    product_sort_values,
+    product_sort_is_keyset,
+)
+from app.utils.pagination import (
+    decode_cursor,
+    decode_offset_cursor,
+    split_keyset_page,
+)
+from app.utils.facets import fetch_product_facets
 from app.utils.r2_service import (
     upload_product_images,
-    delete_image_from_r2,
-    R2_PUBLIC_URL,
+    delete_images_from_r2,
+    extract_r2_key,
+    create_presigned_uploads,
+    confirm_uploaded_keys,
 )
+from app.schemas.image import PresignedUploadRequest, PresignedUploadOut, UploadConfirm
+from app.utils.image_service import process_product_images, variant_keys
 from app.security.r2_config import CLOUDFLARE_BUCKET_NAME_1
-from fastapi_cache.decorator import cache
-from fastapi_cache import FastAPICache
+from app.utils.suggest import (
+    product_suggest,
+    refresh_product_suggestions,
+    remove_product_suggestions,
+)
+from app.core.cache import tagged_cache
+from app.utils.catalog_cache import (
+    PRODUCT_LIST_FIELDS,
+    product_list_cache_key,
+    product_list_model,
+    product_list_tags,
+    product_featured_tags,
+    product_detail_tags,
+    invalidate_products,
+    fetch_product_batch,
+    PRODUCT_DETAIL_NAMESPACE,
+    PRODUCT_DETAIL_EXPIRE,
+)
 
 router = APIRouter(prefix="/api/product")
 
@@ -38,7 +83,7 @@ router = APIRouter(prefix="/api/product")
 )
 async def api_product_add(
     data: ProductDataBase,
-    admin: User = Depends(get_admin_user),
+    admin: UserPrincipal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     product_dict = data.model_dump(exclude={"materials", "images", "variants"})
@@ -53,9 +98,10 @@ async def api_product_add(
     product.materials = [ProductMaterial(**m.model_dump()) for m in data.materials]
     db.add(product)
     await db.commit()
+    await mark_primary_write()
     await db.refresh(product)
-    await FastAPICache.clear(namespace="products:all")
-    await FastAPICache.clear(namespace="products:featured")
+    await refresh_product_suggestions([product.id])
+    await invalidate_products(categories=[product.category], featured=True)
     return product
 
 
@@ -67,8 +113,9 @@ async def api_product_add(
 )
 async def add_images_to_product(
     product_id: int,
+    background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(..., description="Select product images"),
-    admin: User = Depends(get_admin_user),
+    admin: UserPrincipal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     product = await db.get(Product, product_id)
@@ -92,17 +139,85 @@ async def add_images_to_product(
     ]
     db.add_all(new_images)
     await db.commit()
+    await mark_primary_write()
     for img in new_images:
         await db.refresh(img)
-    await FastAPICache.clear(namespace="products:all")
-    await FastAPICache.clear(namespace="products:featured")
+    background_tasks.add_task(process_product_images, [img.id for img in new_images])
+    await refresh_product_suggestions([product_id])
+    await invalidate_products([product_id])
+    return new_images
+
+
+@router.post(
+    "/{product_id}/images/presign",
+    response_model=List[PresignedUploadOut],
+    status_code=status.HTTP_200_OK,
+    summary="Get presigned URLs to upload product images directly to storage",
+)
+async def presign_product_images(
+    product_id: int,
+    data: PresignedUploadRequest,
+    admin: UserPrincipal = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db),
+):
+    exists = await db.scalar(select(Product.id).where(Product.id == product_id))
+    if not exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Product not found"
+        )
+    return create_presigned_uploads(
+        data.files, bucket=CLOUDFLARE_BUCKET_NAME_1, folder=f"products/{product_id}"
+    )
+
+
+@router.post(
+    "/{product_id}/images/confirm",
+    response_model=List[ProductImageOut],
+    status_code=status.HTTP_201_CREATED,
+    summary="Register product images uploaded with presigned URLs",
+)
+async def confirm_product_images(
+    product_id: int,
+    data: UploadConfirm,
+    background_tasks: BackgroundTasks,
+    admin: UserPrincipal = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db),
+):
+    exists = await db.scalar(select(Product.id).where(Product.id == product_id))
+    if not exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Product not found"
+        )
+    image_urls = await confirm_uploaded_keys(
+        data.keys, bucket=CLOUDFLARE_BUCKET_NAME_1, folder=f"products/{product_id}"
+    )
+    confirmed = await db.scalar(
+        select(ProductImage.id).where(ProductImage.image_url.in_(image_urls)).limit(1)
+    )
+    if confirmed:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Some uploads are already confirmed.",
+        )
+    new_images = [
+        ProductImage(product_id=product_id, image_url=url) for url in image_urls
+    ]
+    db.add_all(new_images)
+    await db.commit()
+    await mark_primary_write()
+    for img in new_images:
+        await db.refresh(img)
+    background_tasks.add_task(process_product_images, [img.id for img in new_images])
+    await refresh_product_suggestions([product_id])
+    await invalidate_products([product_id])
     return new_images
 
 
 @router.delete("/images/{image_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_image(
     image_id: int,
-    admin: User = Depends(get_admin_user),
+    background_tasks: BackgroundTasks,
+    admin: UserPrincipal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(select(ProductImage).where(ProductImage.id == image_id))
@@ -111,69 +226,96 @@ async def delete_image(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Image not found."
         )
-    key = image.image_url.replace(f"{R2_PUBLIC_URL}/", "")
-    delete_image_from_r2(key)
+    keys = [extract_r2_key(image.image_url), *variant_keys(image.variants)]
+    product_id = image.product_id
     await db.delete(image)
     await db.commit()
-    await FastAPICache.clear(namespace="products:all")
-    await FastAPICache.clear(namespace="products:featured")
-    await FastAPICache.clear(namespace="products:single")
+    await mark_primary_write()
+    background_tasks.add_task(delete_images_from_r2, keys)
+    await refresh_product_suggestions([product_id])
+    await invalidate_products([product_id])
     return
 
 
-@router.get("/get/all", response_model=ProductListResponse)
-@cache(
-    expire=43200,
+@router.get(
+    "/get/all", response_model=Union[ProductListResponse, ProductCardListResponse]
+)
+@tagged_cache(
     namespace="products:all",
-    key_builder=lambda *args,
-    **kwargs: f"products:all:{kwargs.get('request').url.query if kwargs.get('request') else 'default'}",
+    expire=43200,
+    key=product_list_cache_key,
+    tags=product_list_tags,
+    resolve_model=product_list_model,
 )
 async def api_product_all(
     f: ProductListFilters = Depends(),
     page: int = Query(1, ge=1),
     limit: int = Query(24, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    view: str = Query("full", pattern="^(card|full)$"),
     db: AsyncSession = Depends(get_db),
 ):
-    filtered_query = get_base_product_query()
-    filtered_query = apply_product_filters(filtered_query, f)
-    filtered_sub = filtered_query.subquery()
-    total = await db.scalar(select(func.count()).select_from(filtered_sub))
-    all_query = get_base_product_query()
-    all_sub = all_query.subquery()
-    full_total = await db.scalar(select(func.count()).select_from(all_sub))
-    cat_rows = await db.execute(
-        select(all_sub.c.category, func.count(all_sub.c.id)).group_by(
-            all_sub.c.category
-        )
+    scope = f"products:{product_sort_name(f)}"
+    keyset = product_sort_is_keyset(f)
+    after = None
+    offset = (page - 1) * limit
+    if cursor and keyset:
+        after = decode_cursor(cursor, scope, 2)
+        offset = 0
+    elif cursor:
+        offset = decode_offset_cursor(cursor, scope)
+    total, facets, page_ids = await fetch_product_facets(
+        db, f, offset=offset, limit=limit + 1, after=after
     )
-    category_counts = {"": full_total}
-    for category, count in cat_rows.all():
-        category_counts[category] = count
-    products = (
-        (await db.execute(filtered_query.offset((page - 1) * limit).limit(limit)))
-        .scalars()
-        .all()
+    category_counts = {"": sum(facets["category"].values()), **facets["category"]}
+    products = []
+    if page_ids:
+        query = get_product_card_query() if view == "card" else get_base_product_query()
+        result = await db.execute(query.where(Product.id.in_(page_ids)))
+        by_id = {p.id: p for p in result.scalars().all()}
+        products = [by_id[pid] for pid in page_ids if pid in by_id]
+    products, next_cursor = split_keyset_page(
+        products,
+        limit,
+        scope,
+        lambda p: product_sort_values(f, p) if keyset else [offset + limit],
     )
-    product_data = [ProductDataOut.model_validate(p).model_dump() for p in products]
     response = {
-        "products": product_data,
+        "products": products,
         "total": total,
         "category_counts": category_counts,
+        "facets": facets,
         "current_page": page,
         "total_pages": (total + limit - 1) // limit,
+        "next_cursor": next_cursor,
     }
     return response
 
 
+@router.get(
+    "/suggest",
+    response_model=List[ProductSuggestOut],
+    status_code=status.HTTP_200_OK,
+)
+async def api_product_suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=20),
+):
+    return product_suggest.lookup(q, limit)
+
+
 @router.get(
     "/featured",
     response_model=List[ProductDataOut],
     status_code=status.HTTP_200_OK,
 )
-@cache(
-    expire=43200,
+@tagged_cache(
     namespace="products:featured",
-    key_builder=lambda func, *args, **kwargs: str(kwargs),
+    expire=43200,
+    key=lambda limit, **kwargs: str(limit),
+    tags=product_featured_tags,
+    model=List[ProductDataOut],
+    local=True,
 )
 async def api_product_featured(
     limit: int = Query(12, ge=1, le=24), db: AsyncSession = Depends(get_db)
@@ -201,7 +343,14 @@ async def api_product_featured(
     response_model=ProductDataOut,
     status_code=status.HTTP_200_OK,
 )
-@cache(expire=42300, namespace="products:single")
+@tagged_cache(
+    namespace=PRODUCT_DETAIL_NAMESPACE,
+    expire=PRODUCT_DETAIL_EXPIRE,
+    key=lambda identifier, **kwargs: identifier,
+    tags=product_detail_tags,
+    model=ProductDataOut,
+    local=True,
+)
 async def api_product_detail(identifier: str, db: AsyncSession = Depends(get_db)):
     query = get_base_product_query()
     if identifier.isdigit():
@@ -217,13 +366,27 @@ async def api_product_detail(identifier: str, db: AsyncSession = Depends(get_db)
     return product
 
 
+@router.post(
+    "/get/batch",
+    response_model=List[Optional[ProductDataOut]],
+    status_code=status.HTTP_200_OK,
+)
+async def api_product_batch(
+    data: ProductBatchRequest, db: AsyncSession = Depends(get_db)
+):
+    identifiers = [str(i) for i in data.identifiers]
+    body = await fetch_product_batch(db, identifiers)
+    return Response(content=body, media_type="application/json")
+
+
 @router.delete(
     "/delete/all",
     status_code=status.HTTP_204_NO_CONTENT,
 )
 async def api_delete_all_product(
     data: ProductDeleteMany,
-    admin: User = Depends(get_admin_user),
+    background_tasks: BackgroundTasks,
+    admin: UserPrincipal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     if not data.product_ids:
@@ -231,29 +394,24 @@ async def api_delete_all_product(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Product not found.",
         )
-    result = await db.execute(select(Product).where(Product.id.in_(data.product_ids)))
-    products = result.scalars().all()
-    if not products:
+    result = await db.execute(
+        select(Product.id, Product.category).where(Product.id.in_(data.product_ids))
+    )
+    rows = result.all()
+    product_ids = [row.id for row in rows]
+    if not product_ids:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found.",
         )
-    result_img = await db.execute(
-        select(ProductImage).where(ProductImage.product_id.in_(data.product_ids))
-    )
-    images = result_img.scalars().all()
-    for img in images:
-        key = img.image_url.replace(f"{R2_PUBLIC_URL}/", "")
-        delete_image_from_r2(key)
-    for img in images:
-        await db.delete(img)
-    for product in products:
-        await db.delete(product)
+    image_urls = await delete_products(db=db, product_ids=product_ids)
     await db.commit()
-    await FastAPICache.clear(namespace="products:all")
-    await FastAPICache.clear(namespace="products:featured")
-    for product in products:
-        await FastAPICache.clear(namespace="products:single")
+    await mark_primary_write()
+    background_tasks.add_task(
+        delete_images_from_r2, [extract_r2_key(url) for url in image_urls]
+    )
+    remove_product_suggestions(product_ids)
+    await invalidate_products(product_ids, categories=[row.category for row in rows])
     return
 
 
@@ -263,28 +421,23 @@ async def api_delete_all_product(
 )
 async def api_delete_product(
     product_id: int,
-    admin: User = Depends(get_admin_user),
+    background_tasks: BackgroundTasks,
+    admin: UserPrincipal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
-    product = await get_product(db=db, product_id=product_id)
-    if not product:
+    category = await db.scalar(select(Product.category).where(Product.id == product_id))
+    if category is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Product not found."
         )
-    result_img = await db.execute(
-        select(ProductImage).where(ProductImage.product_id == product_id)
-    )
-    images = result_img.scalars().all()
-    for img in images:
-        key = img.image_url.replace(f"{R2_PUBLIC_URL}/", "")
-        delete_image_from_r2(key)
-    for img in images:
-        await db.delete(img)
-    await db.delete(product)
+    image_urls = await delete_products(db=db, product_ids=[product_id])
     await db.commit()
-    await FastAPICache.clear(namespace="products:all")
-    await FastAPICache.clear(namespace="products:featured")
-    await FastAPICache.clear(namespace="products:single")
+    await mark_primary_write()
+    background_tasks.add_task(
+        delete_images_from_r2, [extract_r2_key(url) for url in image_urls]
+    )
+    remove_product_suggestions([product_id])
+    await invalidate_products([product_id], categories=[category])
     return
 
 
@@ -296,7 +449,7 @@ async def api_delete_product(
 async def api_update_product(
     product_id: int,
     data: ProductUpdate,
-    admin: User = Depends(get_admin_user),
+    admin: UserPrincipal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     product = await get_product(db=db, product_id=product_id)
@@ -305,21 +458,30 @@ async def api_update_product(
             status_code=status.HTTP_404_NOT_FOUND, detail="Product not found."
         )
     payload = data.model_dump(exclude_unset=True, exclude={"materials", "images"})
+    old_category = product.category
+    materials_sent = "materials" in data.model_fields_set
+    list_changed = materials_sent or any(
+        field in payload and payload[field] != getattr(product, field)
+        for field in PRODUCT_LIST_FIELDS
+    )
+    featured_changed = payload.get("is_featured", product.is_featured) != (
+        product.is_featured
+    )
     if "name" in payload and payload["name"] != product.name:
         product.slug = await get_product_slug(payload["name"], db=db)
     for field, value in payload.items():
         setattr(product, field, value)
-    if data.materials is not None:
+    if materials_sent:
         product.materials.clear()
-        for m in data.materials:
+        for m in data.materials or []:
             product.materials.append(ProductMaterial(**m.model_dump()))
-    if data.images is not None:
-        product.images.clear()
-        for i in data.images:
-            product.images.append(ProductImage(**i.model_dump()))
     await db.commit()
+    await mark_primary_write()
     await db.refresh(product)
-    await FastAPICache.clear(namespace="products:all")
-    await FastAPICache.clear(namespace="products:featured")
-    await FastAPICache.clear(namespace="products:single")
+    await refresh_product_suggestions([product.id])
+    await invalidate_products(
+        [product.id],
+        categories={old_category, product.category} if list_changed else (),
+        featured=featured_changed,
+    )
     return product
@@ -10,7 +10,7 @@ from fastapi import (
     File,
     BackgroundTasks,
 )
-from typing import List
+from typing import List, Optional
 from sqlalchemy.orm import selectinload
 from app.db.session import AsyncSession
 from app.db.dependencies import get_db
@@ -25,6 +25,7 @@ from app.schemas.user import (
     UserProfile,
     UserToken,
     UserProfileOut,
+    UserPrincipal,
     UserDeleteMany,
     UserListFilters,
     UserProfileUpdate,
@@ -34,12 +35,14 @@ from app.schemas.user import (
     PlaceDetails,
     AutocompleteResponse,
 )
-from app.security.hash import verify_password
+from app.security.hash import verify_password_async
 from app.security.jwt import (
     create_jwt_token,
     JWT_TOKEN_EXPIRE_DAYS,
     get_current_user,
+    get_current_principal,
     get_admin_user,
+    invalidate_principal,
     verify_jwt_token,
 )
 from app.security.r2_config import CLOUDFLARE_BUCKET_NAME_1
@@ -52,12 +55,25 @@ from app.security.reset_password import (
 from app.utils.r2_service import (
     upload_product_images,
     delete_image_from_r2,
+    delete_images_from_r2,
     extract_r2_key,
+    create_presigned_uploads,
+    confirm_uploaded_keys,
     R2_PUBLIC_URL,
 )
+from app.schemas.image import PresignedUploadFile, PresignedUploadOut, UploadConfirm
 from app.utils.filters import apply_user_filters
+from app.utils.pagination import (
+    apply_keyset_page,
+    split_keyset_page,
+    NEXT_CURSOR_HEADER,
+)
 from app.utils.email_service import send_mail
-from app.utils.geocode import get_place_details, autocomplete_place, reverse_geocoding
+from app.utils.geocode import (
+    get_place_details,
+    debounced_autocomplete_place,
+    cached_reverse_geocoding,
+)
 from app.security.oauth import oauth
 from app.utils.generate_username import generate_username
 from fastapi_cache.decorator import cache
@@ -174,7 +190,7 @@ async def api_user_login(
     if (
         not user
         or not user.password
-        or not verify_password(data.password, user.password)
+        or not await verify_password_async(data.password, user.password)
     ):
         response.delete_cookie(
             key="access_token",
@@ -241,6 +257,54 @@ async def add_images_to_profile(
     return current_user
 
 
+@router.post(
+    "/upload/images/presign",
+    response_model=PresignedUploadOut,
+    status_code=status.HTTP_200_OK,
+)
+async def presign_profile_image(
+    data: PresignedUploadFile,
+    current_user: UserPrincipal = Depends(get_current_principal),
+):
+    return create_presigned_uploads(
+        [data], bucket=CLOUDFLARE_BUCKET_NAME_1, folder=f"profiles/{current_user.id}"
+    )[0]
+
+
+@router.post(
+    "/upload/images/confirm",
+    response_model=UserProfileOut,
+    status_code=status.HTTP_201_CREATED,
+)
+async def confirm_profile_image(
+    data: UploadConfirm,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    if len(data.keys) != 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Exactly one profile image is allowed.",
+        )
+    image_urls = await confirm_uploaded_keys(
+        data.keys, bucket=CLOUDFLARE_BUCKET_NAME_1, folder=f"profiles/{current_user.id}"
+    )
+    if current_user.profile_image == image_urls[0]:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Upload is already confirmed.",
+        )
+    if current_user.profile_image:
+        background_tasks.add_task(
+            delete_images_from_r2, [extract_r2_key(current_user.profile_image)]
+        )
+    current_user.profile_image = image_urls[0]
+    await db.commit()
+    await db.refresh(current_user)
+    return current_user
+
+
 @router.delete(
     "/delete/images", response_model=None, status_code=status.HTTP_204_NO_CONTENT
 )
@@ -280,19 +344,25 @@ async def api_user_logout(response: Response):
     "/get/all", response_model=List[UserProfileOut], status_code=status.HTTP_200_OK
 )
 async def api_get_all_user(
-    admin: User = Depends(get_admin_user),
+    response: Response,
+    admin: UserPrincipal = Depends(get_admin_user),
     f: UserListFilters = Depends(),
     db: AsyncSession = Depends(get_db),
     page: int = Query(1, ge=1),
     limit: int = Query(24, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
 ):
     query = select(User).options(selectinload(User.addresses))
     query = apply_user_filters(query, f)
-    query = query.order_by(User.created_at.desc())
-    offset = (page - 1) * limit
-    query = query.offset(offset).limit(limit)
+    query = apply_keyset_page(
+        query, [User.created_at, User.id], True, "users", cursor, page, limit
+    )
     result = await db.execute(query)
-    users = result.scalars().all()
+    users, next_cursor = split_keyset_page(
+        result.scalars().all(), limit, "users", lambda u: [u.created_at, u.id]
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return users
 
 
@@ -301,7 +371,7 @@ async def api_get_all_user(
 )
 async def api_get_user_profile(
     user_id: int,
-    admin: User = Depends(get_admin_user),
+    admin: UserPrincipal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     user = await get_user(db=db, user_id=user_id)
@@ -318,6 +388,7 @@ async def api_delete_user_me(
 ):
     await db.delete(current_user)
     await db.commit()
+    await invalidate_principal(current_user.id)
     return
 
 
@@ -327,7 +398,7 @@ async def api_delete_user_me(
 )
 async def api_delete_user(
     user_id: int,
-    admin: User = Depends(get_admin_user),
+    admin: UserPrincipal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     user = await get_user(db=db, user_id=user_id)
@@ -337,6 +408,7 @@ async def api_delete_user(
         )
     await db.delete(user)
     await db.commit()
+    await invalidate_principal(user.id)
     return
 
 
@@ -346,7 +418,7 @@ async def api_delete_user(
 )
 async def api_delete_all_user(
     data: UserDeleteMany,
-    admin: User = Depends(get_admin_user),
+    admin: UserPrincipal = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     if not data.user_ids:
@@ -355,6 +427,7 @@ async def api_delete_all_user(
         )
     await db.execute(delete(User).where(User.id.in_(data.user_ids)))
     await db.commit()
+    await invalidate_principal(*data.user_ids)
     return
 
 
@@ -375,7 +448,7 @@ async def api_update_user(
 @router.post("/me/addresses", response_model=UserAddressOut)
 async def api_add_address(
     data: UserAddressCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     count = await db.scalar(
@@ -400,7 +473,7 @@ async def api_add_address(
 @router.delete("/me/address/{address_id}", status_code=204)
 async def api_delete_address(
     address_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     addr = await db.get(UserAddress, address_id)
@@ -426,7 +499,7 @@ async def api_delete_address(
 async def api_update_address(
     address_id: int,
     data: UserAddressUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     addr = await db.get(UserAddress, address_id)
@@ -557,12 +630,13 @@ async def geocode(place_id: str):
 
 
 @router.get("/places/autocomplete", response_model=AutocompleteResponse)
-@cache(expire=21600, namespace="places:autocomplete")
-async def places_autocomplete(input: str = Query(..., min_length=1)):
-    return await autocomplete_place(input)
+async def places_autocomplete(
+    input: str = Query(..., min_length=1),
+    session_token: Optional[str] = Query(default=None, alias="sessionToken"),
+):
+    return await debounced_autocomplete_place(input, session_token)
 
 
 @router.get("/reverse-geocode")
-@cache(expire=86400, namespace="reverse-geocode")
 async def get_address_from_coords(lat: float, lng: float):
-    return await reverse_geocoding(lat, lng)
+    return await cached_reverse_geocoding(lat, lng)
@@ -1,12 +1,19 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
 from app.db.session import AsyncSession
 from app.db.models.product import Product, Wishlist
-from app.db.models.user import User
-from app.security.jwt import get_current_user
+from app.schemas.user import UserPrincipal
+from app.security.jwt import get_current_principal
 from app.schemas.product import WishlistOut, WishlistCreate
 from app.db.dependencies import get_db
+from app.utils.filters import product_detail_options
+from app.utils.pagination import (
+    apply_keyset_page,
+    split_keyset_page,
+    NEXT_CURSOR_HEADER,
+)
 from sqlalchemy.orm import selectinload
 from sqlalchemy import select
+from typing import Optional
 
 router = APIRouter(prefix="/api/wishlist")
 
@@ -15,12 +22,12 @@ router = APIRouter(prefix="/api/wishlist")
 async def api_wishlist_add(
     data: WishlistCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
     product_result = await db.execute(
         select(Product)
         .where(Product.id == data.product_id)
-        .options(selectinload(Product.images), selectinload(Product.materials))
+        .options(*product_detail_options())
     )
     product = product_result.scalar_one_or_none()
     if not product:
@@ -49,7 +56,7 @@ async def api_wishlist_add(
 async def api_wishlist_remove(
     product_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
     existing_result = await db.execute(
         select(Wishlist).where(
@@ -68,21 +75,33 @@ async def api_wishlist_remove(
 
 @router.get("/get", response_model=list[WishlistOut], status_code=status.HTTP_200_OK)
 async def api_wishlist_get(
+    response: Response,
     page: int = Query(1, ge=1),
     limit: int = Query(24, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_principal),
 ):
-    result = await db.execute(
+    query = (
         select(Wishlist)
         .where(Wishlist.user_id == current_user.id)
-        .order_by(Wishlist.created_at.desc())
-        .limit(limit)
-        .offset((page - 1) * limit)
         .options(
-            selectinload(Wishlist.product).selectinload(Product.images),
-            selectinload(Wishlist.product).selectinload(Product.materials),
+            selectinload(Wishlist.product).options(*product_detail_options()),
         )
     )
-    wishlist_items = result.scalars().all()
+    query = apply_keyset_page(
+        query,
+        [Wishlist.created_at, Wishlist.id],
+        True,
+        "wishlist",
+        cursor,
+        page,
+        limit,
+    )
+    result = await db.execute(query)
+    wishlist_items, next_cursor = split_keyset_page(
+        result.scalars().all(), limit, "wishlist", lambda w: [w.created_at, w.id]
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return wishlist_items
@@ -1,5 +1,6 @@
 from pydantic import Field
 from app.schemas.to_camel import BaseConfigModel
+from app.schemas.image import ImageVariantOut
 from datetime import datetime, timezone
 from typing import Optional, List
 
@@ -7,6 +8,7 @@ from typing import Optional, List
 class BlogImageOut(BaseConfigModel):
     id: int = Field(gt=0)
     image_url: str = Field(min_length=1, max_length=255)
+    variants: Optional[List[ImageVariantOut]] = Field(default=None)
 
 
 class BlogCreate(BaseConfigModel):
@@ -24,6 +26,11 @@ class BlogOut(BlogCreate):
     date: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
+class BlogListPage(BaseConfigModel):
+    blogs: List[BlogOut] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(default=None)
+
+
 class BlogUpdate(BaseConfigModel):
     title: Optional[str] = Field(default=None, min_length=1, max_length=200)
     description: Optional[str] = Field(default=None, min_length=1)
@@ -0,0 +1,31 @@
+from pydantic import Field
+from app.schemas.to_camel import BaseConfigModel
+
+
+class ImageVariantOut(BaseConfigModel):
+    width: int = Field(gt=0)
+    format: str = Field(min_length=1, max_length=10)
+    image_url: str = Field(min_length=1, max_length=255)
+
+
+class PresignedUploadFile(BaseConfigModel):
+    filename: str = Field(min_length=1, max_length=255)
+    content_type: str = Field(
+        pattern=r"^image/(jpeg|png|webp|avif|gif)$", max_length=100
+    )
+
+
+class PresignedUploadRequest(BaseConfigModel):
+    files: list[PresignedUploadFile] = Field(min_length=1, max_length=10)
+
+
+class PresignedUploadOut(BaseConfigModel):
+    key: str = Field(min_length=1)
+    upload_url: str = Field(min_length=1)
+    image_url: str = Field(min_length=1)
+    headers: dict[str, str] = Field(default_factory=dict)
+    expires_in: int = Field(gt=0)
+
+
+class UploadConfirm(BaseConfigModel):
+    keys: list[str] = Field(min_length=1, max_length=10)
@@ -1,5 +1,6 @@
 from app.schemas.to_camel import BaseConfigModel
-from typing import Optional, List
+from app.schemas.image import ImageVariantOut
+from typing import Optional, List, Union
 from datetime import datetime, timezone
 from pydantic import Field
 from decimal import Decimal
@@ -9,6 +10,7 @@ class ProductImageOut(BaseConfigModel):
     id: int = Field(default=1)
     image_url: str = Field(min_length=1, max_length=255)
     position: Optional[int] = Field(default=0)
+    variants: Optional[List[ImageVariantOut]] = Field(default=None)
 
 
 class ProductMaterialOut(BaseConfigModel):
@@ -58,6 +60,9 @@ class ProductDataOut(ProductDataBase):
     id: int = Field(gt=0)
     images: List[ProductImageOut] = Field(default_factory=list)
     slug: str = Field(min_length=1, max_length=255)
+    min_price: Optional[Decimal] = Field(default=None)
+    max_price: Optional[Decimal] = Field(default=None)
+    effective_min_price: Optional[Decimal] = Field(default=None)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
@@ -67,7 +72,26 @@ class ProductListResponse(BaseConfigModel):
     total: int = Field(default=0)
     current_page: int = Field(default=1)
     category_counts: dict[str, int] = Field(default_factory=dict)
+    facets: dict[str, dict[str, int]] = Field(default_factory=dict)
     total_pages: int = Field(default=1)
+    next_cursor: Optional[str] = Field(default=None)
+
+
+class ProductCardOut(BaseConfigModel):
+    id: int = Field(gt=0)
+    name: str = Field(min_length=1, max_length=100)
+    slug: str = Field(min_length=1, max_length=255)
+    category: str = Field(min_length=1, max_length=255)
+    motif: str = Field(min_length=1, max_length=100)
+    is_featured: bool = Field(default=False)
+    min_price: Optional[Decimal] = Field(default=None)
+    max_price: Optional[Decimal] = Field(default=None)
+    effective_min_price: Optional[Decimal] = Field(default=None)
+    cover_image: Optional[ProductImageOut] = Field(default=None)
+
+
+class ProductCardListResponse(ProductListResponse):
+    products: list[ProductCardOut] = Field(default_factory=list)
 
 
 class ProductUpdate(BaseConfigModel):
@@ -108,6 +132,17 @@ class CartItemUpdate(BaseConfigModel):
     quantity: Optional[int] = Field(ge=0)
 
 
+class ProductSuggestOut(BaseConfigModel):
+    id: int = Field(gt=0)
+    name: str = Field(min_length=1, max_length=100)
+    slug: str = Field(min_length=1, max_length=255)
+    thumbnail: Optional[str] = Field(default=None)
+
+
+class ProductBatchRequest(BaseConfigModel):
+    identifiers: List[Union[int, str]] = Field(min_length=1, max_length=50)
+
+
 class ProductDeleteMany(BaseConfigModel):
     product_ids: List[int] = Field(default_factory=list)
 
@@ -115,6 +150,10 @@ class ProductDeleteMany(BaseConfigModel):
 class ProductListFilters(BaseConfigModel):
     search: Optional[str] = Field(default=None)
     category: Optional[str] = Field(default=None)
+    motif: Optional[str] = Field(default=None)
+    material: Optional[str] = Field(default=None)
+    size: Optional[str] = Field(default=None)
+    color: Optional[str] = Field(default=None)
     min_price: Optional[float] = Field(default=None)
     max_price: Optional[float] = Field(default=None)
     only_active: bool = Field(default=True)
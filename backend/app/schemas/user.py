@@ -70,6 +70,13 @@ class UserProfileOut(UserProfile):
     addresses: list[UserAddressOut] = Field(default_factory=list)
 
 
+class UserPrincipal(BaseConfigModel):
+    id: int = Field(gt=0)
+    email: str = Field(min_length=1, max_length=100)
+    is_admin: bool = Field(default=False)
+    is_active: bool = Field(default=True)
+
+
 class UserToken(BaseConfigModel):
     message: str = Field(min_length=1)
     user: UserProfileOut = Field(...)
@@ -1,8 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
+from app.core import metrics
+from dotenv import load_dotenv
+import asyncio
 import hashlib
+import time
+import os
 
+load_dotenv()
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
+HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", "2"))
+HASH_POOL_MAX_QUEUE = int(os.getenv("HASH_POOL_MAX_QUEUE", "64"))
+
+hash_executor = ThreadPoolExecutor(
+    max_workers=HASH_POOL_WORKERS, thread_name_prefix="argon2"
+)
+_pending = 0
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -12,5 +28,35 @@ def verify_password(plain_password: str, hash_password: str) -> bool:
     return pwd_context.verify(plain_password, hash_password)
 
 
+async def run_in_hash_pool(name: str, func, *args):
+    global _pending
+    if _pending >= HASH_POOL_MAX_QUEUE:
+        metrics.incr("hash.rejected")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please try again.",
+            headers={"Retry-After": "1"},
+        )
+    _pending += 1
+    metrics.observe("hash.queue_depth", _pending)
+    start = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(hash_executor, func, *args)
+    finally:
+        _pending -= 1
+        metrics.observe(f"hash.{name}", time.perf_counter() - start)
+
+
+async def hash_password_async(password: str) -> str:
+    return await run_in_hash_pool("hash", hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hash_password: str) -> bool:
+    return await run_in_hash_pool(
+        "verify", verify_password, plain_password, hash_password
+    )
+
+
 def hash_token(token: str) -> str:
     return hashlib.sha256(token.encode()).hexdigest()
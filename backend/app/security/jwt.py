@@ -2,9 +2,15 @@ from jose import JWTError, jwt
 from dotenv import load_dotenv
 from fastapi import HTTPException, status, Depends, Request
 from fastapi.security import HTTPBearer
+from cachetools import TTLCache
+from sqlalchemy import select
 from app.db.session import AsyncSession
 from app.db.dependencies import get_db
 from app.db.models.user import User
+from app.crud.user import get_user
+from app.schemas.user import UserPrincipal
+from app.core.cache import add_invalidation_hook, publish_invalidation
+from typing import List, Optional
 import logging
 import pendulum
 import os
@@ -16,6 +22,13 @@ security = HTTPBearer(auto_error=False)
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
 JWT_TOKEN_EXPIRE_DAYS = int(os.getenv("JWT_TOKEN_EXPIRE_DAYS"))
+PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+PRINCIPAL_KEY_PREFIX = "principal:"
+
+_principal_cache: TTLCache = TTLCache(
+    maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL
+)
 
 
 async def create_jwt_token(data: dict) -> str:
@@ -37,9 +50,7 @@ async def verify_jwt_token(token: str) -> dict | None:
         )
 
 
-async def get_current_user(
-    request: Request, credentials=Depends(security), db: AsyncSession = Depends(get_db)
-) -> User:
+async def get_token_payload(request: Request, credentials=Depends(security)) -> dict:
     token = (
         credentials.credentials if credentials else request.cookies.get("access_token")
     )
@@ -47,14 +58,65 @@ async def get_current_user(
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
         )
-    payload = await verify_jwt_token(token)
-    user = await db.get(User, payload["user_id"])
+    return await verify_jwt_token(token)
+
+
+def evict_principals(keys: Optional[List[str]]) -> None:
+    if keys is None:
+        _principal_cache.clear()
+        return
+    for key in keys:
+        if key.startswith(PRINCIPAL_KEY_PREFIX):
+            _principal_cache.pop(int(key.removeprefix(PRINCIPAL_KEY_PREFIX)), None)
+
+
+add_invalidation_hook(evict_principals)
+
+
+async def invalidate_principal(*user_ids: int) -> None:
+    keys = [f"{PRINCIPAL_KEY_PREFIX}{user_id}" for user_id in user_ids]
+    evict_principals(keys)
+    await publish_invalidation(keys)
+
+
+async def load_principal(db: AsyncSession, user_id: int) -> UserPrincipal:
+    result = await db.execute(
+        select(User.id, User.email, User.is_admin, User.is_active).where(
+            User.id == user_id
+        )
+    )
+    row = result.one_or_none()
+    if not row:
+        _principal_cache.pop(user_id, None)
+        raise HTTPException(status_code=401, detail="User not found")
+    principal = UserPrincipal.model_validate(row._mapping)
+    _principal_cache[user_id] = principal
+    return principal
+
+
+async def get_current_principal(
+    payload: dict = Depends(get_token_payload), db: AsyncSession = Depends(get_db)
+) -> UserPrincipal:
+    user_id = payload["user_id"]
+    principal = _principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    return await load_principal(db, user_id)
+
+
+async def get_current_user(
+    payload: dict = Depends(get_token_payload), db: AsyncSession = Depends(get_db)
+) -> User:
+    user = await get_user(db=db, user_id=payload["user_id"])
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     return user
 
 
-async def get_admin_user(user: User = Depends(get_current_user)):
+async def get_admin_user(
+    payload: dict = Depends(get_token_payload), db: AsyncSession = Depends(get_db)
+) -> UserPrincipal:
+    user = await load_principal(db, payload["user_id"])
     if not user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required"
@@ -1,4 +1,4 @@
-from app.security.hash import hash_token, hash_password
+from app.security.hash import hash_token, hash_password_async
 from app.db.session import AsyncSession
 from app.crud.user import get_user
 from fastapi import HTTPException, status
@@ -42,7 +42,7 @@ async def get_user_reset_passsword(db: AsyncSession, token: str):
 
 
 async def update_password(db: AsyncSession, id: int, password: str):
-    hashed_pw = hash_password(password)
+    hashed_pw = await hash_password_async(password)
     query = update(User).where(User.id == id).values(password=hashed_pw)
     await db.execute(query)
     query_token = delete(UserPasswordResetToken).where(
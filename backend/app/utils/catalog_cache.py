@@ -0,0 +1,156 @@
+from app.core.cache import (
+    build_cache_key,
+    cache_lookup_many,
+    invalidate_tags,
+    store_entry,
+)
+from app.core import metrics
+from app.core.serializer import dump_json, serialize
+from app.db.models.product import Product
+from app.db.session import AsyncSession
+from app.utils.filters import get_base_product_query
+from sqlalchemy import or_
+from app.schemas.product import (
+    ProductCardListResponse,
+    ProductDataOut,
+    ProductListFilters,
+    ProductListResponse,
+)
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from typing import Dict, Iterable, List, Optional, Tuple
+import asyncio
+import time
+
+PRODUCT_LIST_FIELDS = (
+    "name",
+    "category",
+    "motif",
+    "is_active",
+    "product_summary",
+    "description",
+)
+PRODUCTS_FEATURED_TAG = "products:featured"
+PRODUCT_DETAIL_NAMESPACE = "products:single"
+PRODUCT_DETAIL_EXPIRE = 42300
+BLOGS_LIST_TAG = "blogs:list"
+
+
+def product_tag(product_id: int) -> str:
+    return f"product:{product_id}"
+
+
+def category_tag(category: Optional[str]) -> str:
+    return f"products:category:{category or '*'}"
+
+
+def blog_tag(blog_id: int) -> str:
+    return f"blog:{blog_id}"
+
+
+def product_list_cache_key(
+    f: ProductListFilters,
+    page: int,
+    limit: int,
+    cursor: Optional[str],
+    view: str = "full",
+    **kwargs,
+) -> str:
+    return f"{f.model_dump_json()}:{page}:{limit}:{cursor}:{view}"
+
+
+def product_list_model(view: str = "full", **kwargs):
+    return ProductCardListResponse if view == "card" else ProductListResponse
+
+
+def product_list_tags(data: dict, f: ProductListFilters, **kwargs) -> List[str]:
+    categories = {f.category} if f.category else {None}
+    categories.update(data.get("facets", {}).get("category", {}).keys())
+    return [
+        *(category_tag(c) for c in categories),
+        *(product_tag(p["id"]) for p in data["products"]),
+    ]
+
+
+def product_featured_tags(data: list, **kwargs) -> List[str]:
+    return [PRODUCTS_FEATURED_TAG, *(product_tag(p["id"]) for p in data)]
+
+
+def product_detail_tags(data: dict, **kwargs) -> List[str]:
+    return [product_tag(data["id"])]
+
+
+def blog_page_tags(data: dict, **kwargs) -> List[str]:
+    return [BLOGS_LIST_TAG, *(blog_tag(b["id"]) for b in data["blogs"])]
+
+
+def blog_detail_tags(data: dict, **kwargs) -> List[str]:
+    return [blog_tag(data["id"])]
+
+
+def render_blog_page(data: dict) -> Tuple[list, dict]:
+    headers = {NEXT_CURSOR_HEADER: data["nextCursor"]} if data["nextCursor"] else {}
+    return data["blogs"], headers
+
+
+async def fetch_product_batch(db: AsyncSession, identifiers: List[str]) -> bytes:
+    keys = [build_cache_key(PRODUCT_DETAIL_NAMESPACE, i) for i in identifiers]
+    entries = await cache_lookup_many(keys, local=True)
+    now = time.time()
+    bodies: Dict[str, bytes] = {}
+    for identifier, entry in zip(identifiers, entries):
+        if entry is not None and entry["soft"] > now:
+            bodies[identifier] = entry["bodies"]["identity"]
+    misses = [i for i in dict.fromkeys(identifiers) if i not in bodies]
+    metrics.incr(f"cache.{PRODUCT_DETAIL_NAMESPACE}.batch_hit", len(bodies))
+    metrics.incr(f"cache.{PRODUCT_DETAIL_NAMESPACE}.batch_miss", len(misses))
+    if misses:
+        ids = [int(i) for i in misses if i.isdigit()]
+        slugs = [i for i in misses if not i.isdigit()]
+        result = await db.execute(
+            get_base_product_query().where(
+                or_(Product.id.in_(ids), Product.slug.in_(slugs))
+            )
+        )
+        found = {}
+        for product in result.scalars().all():
+            found[str(product.id)] = product
+            found[product.slug] = product
+        writes = []
+        for identifier in misses:
+            if identifier not in found:
+                continue
+            data = serialize(ProductDataOut, found[identifier])
+            bodies[identifier] = dump_json(data)
+            writes.append(
+                store_entry(
+                    build_cache_key(PRODUCT_DETAIL_NAMESPACE, identifier),
+                    bodies[identifier],
+                    PRODUCT_DETAIL_EXPIRE,
+                    product_detail_tags(data),
+                    local=True,
+                )
+            )
+        await asyncio.gather(*writes)
+    return b"[" + b",".join(bodies.get(i, b"null") for i in identifiers) + b"]"
+
+
+async def invalidate_products(
+    product_ids: Iterable[int] = (),
+    categories: Iterable[str] = (),
+    featured: bool = False,
+):
+    tags = [product_tag(pid) for pid in product_ids]
+    categories = set(categories)
+    if categories:
+        tags.extend(category_tag(c) for c in categories)
+        tags.append(category_tag(None))
+    if featured:
+        tags.append(PRODUCTS_FEATURED_TAG)
+    await invalidate_tags(*tags)
+
+
+async def invalidate_blogs(blog_ids: Iterable[int] = (), listing: bool = False):
+    tags = [blog_tag(bid) for bid in blog_ids]
+    if listing:
+        tags.append(BLOGS_LIST_TAG)
+    await invalidate_tags(*tags)
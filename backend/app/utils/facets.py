@@ -0,0 +1,175 @@
+from app.db.models.product import Product, ProductVariant, ProductMaterial
+from app.db.session import AsyncSession
+from app.schemas.product import ProductListFilters
+from app.utils.filters import (
+    product_base_clauses,
+    product_facet_clauses,
+    product_sort_keys,
+)
+from sqlalchemy.orm import aliased
+from sqlalchemy import select, func, literal, cast, case, and_, true, String, union_all
+from app.utils.pagination import keyset_condition, keyset_order
+from typing import Any, List, Tuple, Dict, Optional
+
+PRICE_BUCKETS = [
+    (0, 100000),
+    (100000, 250000),
+    (250000, 500000),
+    (500000, 1000000),
+    (1000000, None),
+]
+
+
+def price_bucket_expression(price):
+    whens = []
+    for low, high in PRICE_BUCKETS:
+        label = f"{low}-{high}" if high is not None else f"{low}+"
+        condition = price >= low if high is None else (price >= low) & (price < high)
+        whens.append((condition, label))
+    return case(*whens, else_=None)
+
+
+def facet_matches(flags: Dict[str, Any], exclude: Optional[str] = None):
+    return and_(true(), *(flag for name, flag in flags.items() if name != exclude))
+
+
+def facet_select(name: str, filtered, column, matches, join=None, bucket=None):
+    values = select(
+        filtered.c.id.label("product_id"), column.label("value")
+    ).select_from(filtered)
+    if join is not None:
+        values = values.join(*join)
+    values = values.where(matches).subquery()
+    if bucket is not None:
+        values = select(
+            values.c.product_id, bucket(values.c.value).label("value")
+        ).subquery()
+    return (
+        select(
+            literal(name).label("facet"),
+            cast(values.c.value, String).label("value"),
+            func.count(func.distinct(values.c.product_id)).label("count"),
+        )
+        .where(values.c.value.is_not(None))
+        .group_by(values.c.value)
+    )
+
+
+def build_filtered_cte(f: ProductListFilters):
+    clauses = product_facet_clauses(f)
+    keys, _ = product_sort_keys(f)
+    base = select(
+        Product.id.label("id"),
+        Product.category.label("category"),
+        Product.motif.label("motif"),
+        Product.effective_min_price.label("price"),
+        *(key.label(f"sort_{idx}") for idx, key in enumerate(keys)),
+        *(clause.label(f"match_{name}") for name, clause in clauses.items()),
+    ).where(*product_base_clauses(f))
+    if len(clauses) > 1:
+        misses = sum(case((clause, 0), else_=1) for clause in clauses.values())
+        base = base.where(misses <= 1)
+    filtered = base.cte("filtered").prefix_with("MATERIALIZED")
+    flags = {name: filtered.c[f"match_{name}"] for name in clauses}
+    sort_keys = [filtered.c[f"sort_{idx}"] for idx in range(len(keys))]
+    return filtered, flags, sort_keys
+
+
+def build_facet_query(
+    f: ProductListFilters, offset: int, limit: int, after: Optional[list] = None
+):
+    filtered, flags, sort_keys = build_filtered_cte(f)
+    _, descending = product_sort_keys(f)
+    sort = keyset_order(sort_keys, descending)
+    matches_all = facet_matches(flags)
+    page_clauses = [matches_all]
+    if after is not None:
+        page_clauses.append(keyset_condition(sort_keys, after, descending))
+    total = select(
+        literal("total").label("facet"),
+        literal("").label("value"),
+        func.count(filtered.c.id).label("count"),
+    ).where(matches_all)
+    page = (
+        select(
+            literal("page").label("facet"),
+            cast(filtered.c.id, String).label("value"),
+            func.row_number().over(order_by=sort).label("count"),
+        )
+        .where(*page_clauses)
+        .order_by(*sort)
+        .offset(offset)
+        .limit(limit)
+    )
+    material = aliased(ProductMaterial)
+    variant = aliased(ProductVariant)
+    variant_join = (variant, variant.product_id == filtered.c.id)
+    return union_all(
+        total,
+        facet_select(
+            "category",
+            filtered,
+            filtered.c.category,
+            facet_matches(flags, "category"),
+        ),
+        facet_select(
+            "motif", filtered, filtered.c.motif, facet_matches(flags, "motif")
+        ),
+        facet_select(
+            "material",
+            filtered,
+            material.material,
+            facet_matches(flags, "material"),
+            (material, material.product_id == filtered.c.id),
+        ),
+        facet_select(
+            "size",
+            filtered,
+            variant.size,
+            facet_matches(flags, "size"),
+            variant_join,
+        ),
+        facet_select(
+            "color",
+            filtered,
+            variant.color,
+            facet_matches(flags, "color"),
+            variant_join,
+        ),
+        facet_select(
+            "price",
+            filtered,
+            filtered.c.price,
+            facet_matches(flags, "price"),
+            bucket=price_bucket_expression,
+        ),
+        page,
+    )
+
+
+async def fetch_product_facets(
+    db: AsyncSession,
+    f: ProductListFilters,
+    offset: int,
+    limit: int,
+    after: Optional[list] = None,
+) -> Tuple[int, Dict[str, Dict[str, int]], List[int]]:
+    result = await db.execute(build_facet_query(f, offset, limit, after))
+    total = 0
+    facets: Dict[str, Dict[str, int]] = {
+        "category": {},
+        "motif": {},
+        "material": {},
+        "size": {},
+        "color": {},
+        "price": {},
+    }
+    page: List[Tuple[int, int]] = []
+    for facet, value, count in result.all():
+        if facet == "total":
+            total = count
+        elif facet == "page":
+            page.append((count, int(value)))
+        else:
+            facets[facet][value] = count
+    return total, facets, [product_id for _, product_id in sorted(page)]
@@ -1,67 +1,152 @@
-from sqlalchemy.orm import selectinload
-from app.db.models.product import Product, ProductVariant
+from sqlalchemy.orm import load_only, noload, selectinload
+from app.db.models.product import Product, ProductImage, ProductVariant, ProductMaterial
 from app.db.models.user import User
 from app.schemas.user import UserListFilters
 from app.schemas.product import ProductListFilters
-from sqlalchemy import select, func
+from app.utils.pagination import keyset_order
+from app.utils.search import (
+    build_prefix_query,
+    product_search_clause,
+    product_search_rank,
+)
+from sqlalchemy import and_, func, literal_column, select
+from decimal import Decimal
 
 
-def get_base_product_query():
-    query = select(Product).options(
+def product_detail_options():
+    return (
         selectinload(Product.materials),
         selectinload(Product.images),
+        selectinload(Product.variants),
     )
+
+
+def get_base_product_query():
+    query = select(Product).options(*product_detail_options())
     return query
 
 
-def apply_product_filters(query, f: ProductListFilters):
+def product_card_options():
+    return (
+        load_only(
+            Product.id,
+            Product.name,
+            Product.slug,
+            Product.category,
+            Product.motif,
+            Product.is_featured,
+            Product.min_price,
+            Product.max_price,
+            Product.effective_min_price,
+            Product.created_at,
+        ),
+        noload(Product.materials),
+        noload(Product.variants),
+        selectinload(Product.images).load_only(
+            ProductImage.image_url, ProductImage.position, ProductImage.variants
+        ),
+    )
+
+
+def get_product_card_query():
+    return select(Product).options(*product_card_options())
+
+
+def product_base_clauses(f: ProductListFilters):
+    clauses = []
     if f.only_active is not None:
-        query = query.where(Product.is_active.is_(f.only_active))
-    if f.search:
-        term = f"%{f.search.strip()}%"
-        query = query.where(
-            (Product.name.ilike(term)) | (Product.description.ilike(term))
-        )
+        clauses.append(Product.is_active.is_(f.only_active))
+    if build_prefix_query(f.search):
+        clauses.append(product_search_clause(f.search))
+    return clauses
+
+
+def product_facet_clauses(f: ProductListFilters) -> dict:
+    clauses = {}
     if f.category is not None:
-        query = query.where(Product.category == f.category)
-    if f.min_price is not None:
-        subq = (
-            select(func.min(ProductVariant.regular_price))
-            .where(ProductVariant.product_id == Product.id)
-            .scalar_subquery()
+        clauses["category"] = Product.category == f.category
+    if f.motif is not None:
+        clauses["motif"] = Product.motif == f.motif
+    if f.material is not None:
+        clauses["material"] = Product.materials.any(
+            ProductMaterial.material == f.material
         )
-        query = query.where(subq >= f.min_price)
+    if f.size is not None:
+        clauses["size"] = Product.variants.any(ProductVariant.size == f.size)
+    if f.color is not None:
+        clauses["color"] = Product.variants.any(ProductVariant.color == f.color)
+    price = []
+    if f.min_price is not None:
+        price.append(Product.effective_min_price >= f.min_price)
     if f.max_price is not None:
-        subq = (
-            select(func.max(ProductVariant.regular_price))
-            .where(ProductVariant.product_id == Product.id)
-            .scalar_subquery()
-        )
-        query = query.where(subq <= f.max_price)
-    match f.sort:
-        case "newest":
-            query = query.order_by(Product.created_at.desc())
+        price.append(Product.effective_min_price <= f.max_price)
+    if price:
+        clauses["price"] = and_(*price)
+    return clauses
+
+
+def product_filter_clauses(f: ProductListFilters, exclude: frozenset = frozenset()):
+    return [
+        *product_base_clauses(f),
+        *(
+            clause
+            for name, clause in product_facet_clauses(f).items()
+            if name not in exclude
+        ),
+    ]
+
+
+def product_price_sort_key():
+    return func.coalesce(Product.effective_min_price, literal_column("0"))
+
+
+PRODUCT_SORTS = ("newest", "price_high", "price_low", "asc", "desc", "relevance")
+
+
+def product_sort_name(f: ProductListFilters) -> str:
+    if f.sort == "relevance" and not build_prefix_query(f.search):
+        return "newest"
+    return f.sort if f.sort in PRODUCT_SORTS else "newest"
+
+
+def product_sort_is_keyset(f: ProductListFilters) -> bool:
+    return product_sort_name(f) != "relevance"
+
+
+def product_sort_keys(f: ProductListFilters):
+    match product_sort_name(f):
         case "price_high":
-            subq = (
-                select(func.min(ProductVariant.regular_price))
-                .where(ProductVariant.product_id == Product.id)
-                .scalar_subquery()
-            )
-            query = query.order_by(subq.desc())  # highest first
+            return [product_price_sort_key(), Product.id], True
         case "price_low":
-            subq = (
-                select(func.min(ProductVariant.regular_price))
-                .where(ProductVariant.product_id == Product.id)
-                .scalar_subquery()
-            )
-            query = query.order_by(subq.asc())  # lowest first
+            return [product_price_sort_key(), Product.id], False
         case "asc":
-            query = query.order_by(Product.name.asc())
+            return [Product.name, Product.id], False
         case "desc":
-            query = query.order_by(Product.name.desc())
+            return [Product.name, Product.id], True
+        case "relevance":
+            return [product_search_rank(f.search), Product.id], True
         case _:
-            query = query.order_by(Product.created_at.desc())
-    return query
+            return [Product.created_at, Product.id], True
+
+
+def product_sort_values(f: ProductListFilters, product: Product) -> list:
+    match product_sort_name(f):
+        case "price_high" | "price_low":
+            return [product.effective_min_price or Decimal("0"), product.id]
+        case "asc" | "desc":
+            return [product.name, product.id]
+        case _:
+            return [product.created_at, product.id]
+
+
+def product_sort_clauses(f: ProductListFilters):
+    keys, descending = product_sort_keys(f)
+    return keyset_order(keys, descending)
+
+
+def apply_product_filters(query, f: ProductListFilters):
+    query = query.where(*product_filter_clauses(f))
+    return query.order_by(*product_sort_clauses(f))
 
 
 def apply_user_filters(query, f: UserListFilters):
@@ -1,6 +1,10 @@
-import requests
+import httpx
 from fastapi import HTTPException, status
 from dotenv import load_dotenv
+from app.core.singleflight import SingleFlight
+from app.core.redis import redis_client
+from app.core import metrics
+from app.utils.geohash import encode_geohash
 from app.schemas.user import (
     PlaceDetails,
     AutocompleteResponse,
@@ -9,11 +13,65 @@ from app.schemas.user import (
     ReverseGeocodingResponse,
     ReverseGeocodingResult,
 )
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import asyncio
+import logging
+import re
 import os
 
 load_dotenv()
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+GOOGLE_MAPS_BASE_URL = os.getenv(
+    "GOOGLE_MAPS_BASE_URL", "https://maps.googleapis.com/maps/api"
+)
+GOOGLE_MAPS_MAX_CONNECTIONS = int(os.getenv("GOOGLE_MAPS_MAX_CONNECTIONS", "20"))
+REVERSE_GEOCODE_PRECISION = int(os.getenv("REVERSE_GEOCODE_PRECISION", "8"))
+REVERSE_GEOCODE_EXPIRE = int(os.getenv("REVERSE_GEOCODE_EXPIRE", "86400"))
+AUTOCOMPLETE_EXPIRE = int(os.getenv("AUTOCOMPLETE_EXPIRE", "21600"))
+AUTOCOMPLETE_MIN_PREFIX = int(os.getenv("AUTOCOMPLETE_MIN_PREFIX", "3"))
+AUTOCOMPLETE_DEBOUNCE_MS = int(os.getenv("AUTOCOMPLETE_DEBOUNCE_MS", "150"))
+AUTOCOMPLETE_MAX_PREDICTIONS = 5
+
+logger = logging.getLogger(__name__)
+
+_maps_client: httpx.AsyncClient | None = None
+_maps_flights = SingleFlight()
+_reverse_flights = SingleFlight()
+_autocomplete_flights = SingleFlight()
+
+
+def get_maps_client() -> httpx.AsyncClient:
+    global _maps_client
+    if _maps_client is None:
+        _maps_client = httpx.AsyncClient(
+            base_url=GOOGLE_MAPS_BASE_URL,
+            timeout=httpx.Timeout(10.0, connect=3.0),
+            limits=httpx.Limits(
+                max_connections=GOOGLE_MAPS_MAX_CONNECTIONS,
+                max_keepalive_connections=GOOGLE_MAPS_MAX_CONNECTIONS,
+            ),
+        )
+    return _maps_client
+
+
+async def close_maps_client():
+    global _maps_client
+    if _maps_client is not None:
+        await _maps_client.aclose()
+        _maps_client = None
+
+
+async def maps_get(path: str, params: dict, timeout: float) -> dict:
+    async def fetch() -> dict:
+        metrics.incr("geocode.upstream_calls")
+        response = await get_maps_client().get(path, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    key = (path, tuple(sorted(params.items())))
+    if _maps_flights.in_flight(key):
+        metrics.incr("geocode.coalesced")
+    return await _maps_flights.do(key, fetch)
 
 
 def extract_components(result: dict) -> dict:
@@ -27,14 +85,18 @@ def extract_components(result: dict) -> dict:
 
 
 async def get_place_details(place_id: str):
-    url = "https://maps.googleapis.com/maps/api/place/details/json"
     params = {
         "place_id": place_id,
         "key": GOOGLE_API_KEY,
         "fields": "formatted_address,geometry,address_components,place_id",
         "language": "en",
     }
-    res = requests.get(url, params=params, timeout=10).json()
+    try:
+        res = await maps_get("/place/details/json", params, timeout=10)
+    except httpx.HTTPError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Google API error: {e}"
+        )
     if res["status"] != "OK":
         raise HTTPException(
             status_code=400, detail=res.get("error_message", "Place not found")
@@ -67,7 +129,6 @@ async def get_place_details(place_id: str):
 
 
 async def autocomplete_place(input: str) -> AutocompleteResponse:
-    url = "https://maps.googleapis.com/maps/api/place/autocomplete/json"
     params = {
         "input": input,
         "key": GOOGLE_API_KEY,
@@ -75,10 +136,8 @@ async def autocomplete_place(input: str) -> AutocompleteResponse:
         "language": "en",
     }
     try:
-        res = requests.get(url, params=params, timeout=5)
-        res.raise_for_status()
-        data = res.json()
-    except requests.RequestException as e:
+        data = await maps_get("/place/autocomplete/json", params, timeout=5)
+    except httpx.HTTPError as e:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Google API error: {e}"
         )
@@ -101,7 +160,6 @@ async def autocomplete_place(input: str) -> AutocompleteResponse:
 
 
 async def reverse_geocoding(lat: float, lng: float) -> ReverseGeocodingResponse:
-    url = "https://maps.googleapis.com/maps/api/geocode/json"
     params = {
         "latlng": f"{lat},{lng}",
         "key": GOOGLE_API_KEY,
@@ -109,10 +167,8 @@ async def reverse_geocoding(lat: float, lng: float) -> ReverseGeocodingResponse:
         "result_type": "street_address|route",
     }
     try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-    except requests.RequestException as e:
+        data = await maps_get("/geocode/json", params, timeout=10)
+    except httpx.HTTPError as e:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Google Geocoding API error: {e}",
@@ -166,3 +222,136 @@ async def reverse_geocoding(lat: float, lng: float) -> ReverseGeocodingResponse:
         results.append(structured)
 
     return ReverseGeocodingResponse(results=results, status=data["status"])
+
+
+async def cached_reverse_geocoding(lat: float, lng: float) -> ReverseGeocodingResponse:
+    cell = encode_geohash(lat, lng, REVERSE_GEOCODE_PRECISION)
+    key = f"reverse-geocode:{REVERSE_GEOCODE_PRECISION}:{cell}"
+    try:
+        cached = await redis_client.get(key)
+    except Exception as e:
+        logger.warning("Reverse geocode cache read failed: %s", e)
+        cached = None
+    if cached is not None:
+        metrics.incr("geocode.reverse.cache_hit")
+        response = ReverseGeocodingResponse.model_validate_json(cached)
+    else:
+        metrics.incr("geocode.reverse.cache_miss")
+
+        async def fill() -> ReverseGeocodingResponse:
+            result = await reverse_geocoding(lat, lng)
+            try:
+                await redis_client.set(
+                    key, result.model_dump_json(), ex=REVERSE_GEOCODE_EXPIRE
+                )
+            except Exception as e:
+                logger.warning("Reverse geocode cache write failed: %s", e)
+            return result
+
+        response = await _reverse_flights.do(key, fill)
+    return response.model_copy(
+        update={
+            "results": [
+                r.model_copy(update={"lat": lat, "lng": lng}) for r in response.results
+            ]
+        }
+    )
+
+
+def normalize_autocomplete_input(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def filter_predictions(
+    predictions: list[AutocompleteResult], query: str
+) -> list[AutocompleteResult]:
+    tokens = query.split()
+    matched = []
+    for prediction in predictions:
+        words = re.split(r"[^\w]+", prediction.description.lower())
+        if all(any(w.startswith(t) for w in words) for t in tokens):
+            matched.append(prediction)
+    return matched
+
+
+async def cached_autocomplete_place(input: str) -> AutocompleteResponse:
+    normalized = normalize_autocomplete_input(input)
+    prefixes = [normalized] + [
+        normalized[:i]
+        for i in range(len(normalized) - 1, AUTOCOMPLETE_MIN_PREFIX - 1, -1)
+    ]
+    keys = [f"places:autocomplete:{p}" for p in prefixes]
+    try:
+        values = await redis_client.mget(keys)
+    except Exception as e:
+        logger.warning("Autocomplete cache read failed: %s", e)
+        values = [None] * len(keys)
+    for prefix, raw in zip(prefixes, values):
+        if raw is None:
+            continue
+        cached = AutocompleteResponse.model_validate_json(raw)
+        if prefix == normalized:
+            metrics.incr("geocode.autocomplete.cache_hit")
+            return cached
+        if len(cached.predictions) >= AUTOCOMPLETE_MAX_PREDICTIONS:
+            continue
+        filtered = filter_predictions(cached.predictions, normalized)
+        if filtered:
+            metrics.incr("geocode.autocomplete.prefix_hit")
+            return AutocompleteResponse(predictions=filtered)
+    metrics.incr("geocode.autocomplete.cache_miss")
+
+    async def fill() -> AutocompleteResponse:
+        result = await autocomplete_place(input)
+        try:
+            await redis_client.set(
+                keys[0], result.model_dump_json(), ex=AUTOCOMPLETE_EXPIRE
+            )
+        except Exception as e:
+            logger.warning("Autocomplete cache write failed: %s", e)
+        return result
+
+    return await _autocomplete_flights.do(keys[0], fill)
+
+
+class SessionDebouncer:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._latest: dict[str, asyncio.Task] = {}
+
+    async def _delayed(self, func):
+        await asyncio.sleep(self.delay)
+        return await func()
+
+    async def run(self, session: str, func):
+        previous = self._latest.get(session)
+        if previous is not None and not previous.done():
+            previous.cancel()
+        task = asyncio.ensure_future(self._delayed(func))
+        self._latest[session] = task
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if not task.cancelled() or asyncio.current_task().cancelling():
+                raise
+            metrics.incr("geocode.autocomplete.superseded")
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Superseded by a newer autocomplete request.",
+            )
+        finally:
+            if self._latest.get(session) is task:
+                del self._latest[session]
+
+
+autocomplete_debouncer = SessionDebouncer(AUTOCOMPLETE_DEBOUNCE_MS / 1000)
+
+
+async def debounced_autocomplete_place(
+    input: str, session_token: Optional[str] = None
+) -> AutocompleteResponse:
+    if not session_token:
+        return await cached_autocomplete_place(input)
+    return await autocomplete_debouncer.run(
+        session_token, lambda: cached_autocomplete_place(input)
+    )
@@ -0,0 +1,42 @@
+from PIL import Image, ImageOps, features
+from io import BytesIO
+from typing import List, Tuple
+
+FORMAT_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "avif": {"format": "AVIF", "quality": 60},
+    "jpeg": {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+}
+
+
+def supported_formats(formats: List[str]) -> List[str]:
+    supported = []
+    for fmt in formats:
+        if fmt not in FORMAT_OPTIONS:
+            continue
+        if fmt in ("webp", "avif") and not features.check(fmt):
+            continue
+        supported.append(fmt)
+    return supported
+
+
+def render_variants(
+    data: bytes, widths: List[int], formats: List[str]
+) -> List[Tuple[int, str, bytes]]:
+    rendered = []
+    with Image.open(BytesIO(data)) as source:
+        image = ImageOps.exif_transpose(source)
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+        targets = sorted({w for w in widths if w < image.width}) or [image.width]
+        for width in targets:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+            for fmt in supported_formats(formats):
+                frame = resized
+                if fmt == "jpeg" and has_alpha:
+                    frame = resized.convert("RGB")
+                buffer = BytesIO()
+                frame.save(buffer, **FORMAT_OPTIONS[fmt])
+                rendered.append((width, fmt, buffer.getvalue()))
+    return rendered
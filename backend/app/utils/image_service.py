@@ -0,0 +1,129 @@
+from concurrent.futures import ProcessPoolExecutor
+from app.db.session import AsyncSessionLocal
+from app.db.dependencies import mark_primary_write
+from app.db.models.product import ProductImage
+from app.db.models.blog import BlogImage
+from app.security.r2_config import get_r2_client, CLOUDFLARE_BUCKET_NAME_1
+from app.utils.image_processing import render_variants
+from app.utils.r2_service import extract_r2_key, R2_PUBLIC_URL
+from app.utils.catalog_cache import invalidate_products, invalidate_blogs
+from app.utils.suggest import refresh_product_suggestions
+from dotenv import load_dotenv
+from typing import List, Dict, Set
+import multiprocessing
+import logging
+import asyncio
+import os
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+IMAGE_VARIANT_WIDTHS = [
+    int(w) for w in os.getenv("IMAGE_VARIANT_WIDTHS", "320,640,1024,1600").split(",")
+]
+IMAGE_VARIANT_FORMATS = os.getenv("IMAGE_VARIANT_FORMATS", "webp,avif").split(",")
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+MIME_TYPES = {"webp": "image/webp", "avif": "image/avif", "jpeg": "image/jpeg"}
+
+_image_executor: ProcessPoolExecutor | None = None
+
+
+def get_image_executor() -> ProcessPoolExecutor:
+    global _image_executor
+    if _image_executor is None:
+        _image_executor = ProcessPoolExecutor(
+            max_workers=IMAGE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _image_executor
+
+
+def shutdown_image_executor():
+    if _image_executor is not None:
+        _image_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _download(bucket: str, key: str) -> bytes:
+    return get_r2_client().get_object(Bucket=bucket, Key=key)["Body"].read()
+
+
+def _upload(bucket: str, key: str, body: bytes, content_type: str):
+    get_r2_client().put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=body,
+        ContentType=content_type,
+        CacheControl="public, max-age=31536000, immutable",
+    )
+
+
+async def build_image_variants(image_url: str, bucket: str) -> List[Dict]:
+    key = extract_r2_key(image_url)
+    data = await asyncio.to_thread(_download, bucket, key)
+    loop = asyncio.get_running_loop()
+    rendered = await loop.run_in_executor(
+        get_image_executor(),
+        render_variants,
+        data,
+        IMAGE_VARIANT_WIDTHS,
+        IMAGE_VARIANT_FORMATS,
+    )
+    base_key = key.rsplit(".", 1)[0]
+    variants = []
+    uploads = []
+    for width, fmt, body in rendered:
+        variant_key = f"{base_key}-{width}w.{fmt}"
+        uploads.append(
+            asyncio.to_thread(_upload, bucket, variant_key, body, MIME_TYPES[fmt])
+        )
+        variants.append(
+            {
+                "width": width,
+                "format": fmt,
+                "image_url": f"{R2_PUBLIC_URL}/{variant_key}",
+            }
+        )
+    await asyncio.gather(*uploads)
+    return variants
+
+
+async def process_image_variants(
+    model, owner_field: str, image_ids: List[int], bucket: str
+) -> Set[int]:
+    owners = set()
+    async with AsyncSessionLocal() as db:
+        for image_id in image_ids:
+            image = await db.get(model, image_id)
+            if not image:
+                continue
+            try:
+                image.variants = await build_image_variants(image.image_url, bucket)
+                owners.add(getattr(image, owner_field))
+            except Exception as e:
+                logger.exception("Failed to build variants for %s: %s", image_id, e)
+        await db.commit()
+    if owners:
+        await mark_primary_write()
+    return owners
+
+
+async def process_product_images(
+    image_ids: List[int], bucket: str = CLOUDFLARE_BUCKET_NAME_1
+):
+    product_ids = await process_image_variants(
+        ProductImage, "product_id", image_ids, bucket
+    )
+    if product_ids:
+        await refresh_product_suggestions(list(product_ids))
+        await invalidate_products(product_ids)
+
+
+async def process_blog_images(
+    image_ids: List[int], bucket: str = CLOUDFLARE_BUCKET_NAME_1
+):
+    blog_ids = await process_image_variants(BlogImage, "blog_id", image_ids, bucket)
+    if blog_ids:
+        await invalidate_blogs(blog_ids)
+
+
+def variant_keys(variants: List[Dict] | None) -> List[str]:
+    return [extract_r2_key(v["image_url"]) for v in variants or []]
@@ -0,0 +1,99 @@
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+import base64
+import json
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def decode_cursor_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+        raise ValueError("Unknown cursor value")
+    return value
+
+
+def encode_cursor(scope: str, values: Sequence[Any]) -> str:
+    payload = {"s": scope, "k": [encode_cursor_value(v) for v in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, scope: str, size: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["k"]
+        if payload["s"] != scope or not isinstance(values, list):
+            raise ValueError("Cursor scope mismatch")
+        if len(values) != size:
+            raise ValueError("Cursor size mismatch")
+        return [decode_cursor_value(v) for v in values]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        )
+
+
+def decode_offset_cursor(cursor: str, scope: str) -> int:
+    (offset,) = decode_cursor(cursor, scope, 1)
+    if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        )
+    return offset
+
+
+def keyset_condition(keys: Sequence[Any], values: Sequence[Any], descending: bool):
+    left = tuple_(*keys)
+    right = tuple_(*values)
+    return left < right if descending else left > right
+
+
+def keyset_order(keys: Sequence[Any], descending: bool) -> list:
+    return [key.desc() if descending else key.asc() for key in keys]
+
+
+def apply_keyset_page(
+    query,
+    keys: Sequence[Any],
+    descending: bool,
+    scope: str,
+    cursor: Optional[str],
+    page: int,
+    limit: int,
+):
+    query = query.order_by(*keyset_order(keys, descending))
+    if cursor:
+        after = decode_cursor(cursor, scope, len(keys))
+        query = query.where(keyset_condition(keys, after, descending))
+    else:
+        query = query.offset((page - 1) * limit)
+    return query.limit(limit + 1)
+
+
+def split_keyset_page(
+    rows: Sequence[Any],
+    limit: int,
+    scope: str,
+    sort_values: Callable[[Any], Sequence[Any]],
+) -> Tuple[List[Any], Optional[str]]:
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(scope, sort_values(rows[-1]))
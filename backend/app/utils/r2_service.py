@@ -1,54 +1,159 @@
 from app.security.r2_config import get_r2_client, CLOUDFLARE_BUCKET_NAME_1
-from fastapi import UploadFile
-from typing import List, Dict
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+from fastapi import UploadFile, HTTPException, status
+from typing import List, Dict, BinaryIO, Optional, Tuple
 from dotenv import load_dotenv
+import logging
+import asyncio
 import uuid
 import os
 import re
 
 load_dotenv()
+logger = logging.getLogger(__name__)
 client = get_r2_client()
 CLOUDFLARE_ACCOUNT_ID = os.getenv("CLOUDFLARE_ACCOUNT_ID")
 R2_PUBLIC_URL = os.getenv("R2_PUBLIC_URL")
+R2_UPLOAD_CONCURRENCY = int(os.getenv("R2_UPLOAD_CONCURRENCY", "4"))
+R2_DELETE_BATCH_SIZE = 1000
+R2_PRESIGN_EXPIRE = int(os.getenv("R2_PRESIGN_EXPIRE", "900"))
+R2_MAX_UPLOAD_BYTES = int(os.getenv("R2_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+R2_MULTIPART_THRESHOLD = int(os.getenv("R2_MULTIPART_THRESHOLD", str(8 * 1024 * 1024)))
+
+transfer_config = TransferConfig(
+    multipart_threshold=R2_MULTIPART_THRESHOLD,
+    multipart_chunksize=R2_MULTIPART_THRESHOLD,
+)
+
+
+def build_object_key(original_name: str, folder: str, idx: int = 0) -> Tuple[str, str]:
+    ext = original_name.rsplit(".", 1)[-1].lower() if "." in original_name else "jpg"
+    clean_name = re.sub(r"[^\w\-_.]", "-", original_name.lower())
+    clean_name = re.sub(r"-+", "-", clean_name)
+    clean_name = clean_name.strip("-_.")
+    clean_name = clean_name or f"image-{idx + 1}"
+    unique_suffix = uuid.uuid4().hex[:8]
+    final_filename = f"{clean_name}-{unique_suffix}.{ext}"
+    return f"{folder}/{final_filename}", final_filename
+
+
+def _file_size(fileobj: BinaryIO) -> int:
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell()
+    fileobj.seek(0)
+    return size
+
+
+def _upload_fileobj(fileobj: BinaryIO, bucket: str, key: str, content_type: str):
+    fileobj.seek(0)
+    get_r2_client().upload_fileobj(
+        fileobj,
+        bucket,
+        key,
+        ExtraArgs={"ContentType": content_type},
+        Config=transfer_config,
+    )
 
 
 async def upload_product_images(
     files: List[UploadFile], bucket: str, folder: str = "products"
 ) -> List[Dict]:
+    semaphore = asyncio.Semaphore(R2_UPLOAD_CONCURRENCY)
+
+    async def upload(idx: int, file: UploadFile) -> Optional[Dict]:
+        if not file.filename:
+            return None
+        size = file.size
+        if size is None:
+            size = await asyncio.to_thread(_file_size, file.file)
+        if not size:
+            return None
+        key, final_filename = build_object_key(file.filename, folder, idx)
+        async with semaphore:
+            await asyncio.to_thread(
+                _upload_fileobj,
+                file.file,
+                bucket,
+                key,
+                file.content_type or "image/jpeg",
+            )
+        return {
+            "image_url": f"{R2_PUBLIC_URL}/{key}",
+            "filename": final_filename,
+        }
+
+    results = await asyncio.gather(
+        *(upload(idx, file) for idx, file in enumerate(files))
+    )
+    return [r for r in results if r]
+
+
+def create_presigned_uploads(files: list, bucket: str, folder: str) -> List[Dict]:
     client = get_r2_client()
-    uploaded = []
+    uploads = []
     for idx, file in enumerate(files):
-        if not file.filename:
-            continue
-        contents = await file.read()
-        if not contents:
-            continue
-        original_name = file.filename
-        ext = (
-            original_name.rsplit(".", 1)[-1].lower() if "." in original_name else "jpg"
+        key, _ = build_object_key(file.filename, folder, idx)
+        upload_url = client.generate_presigned_url(
+            "put_object",
+            Params={"Bucket": bucket, "Key": key, "ContentType": file.content_type},
+            ExpiresIn=R2_PRESIGN_EXPIRE,
         )
-        clean_name = re.sub(r"[^\w\-_.]", "-", original_name.lower())
-        clean_name = re.sub(r"-+", "-", clean_name)
-        clean_name = clean_name.strip("-_.")
-        clean_name = clean_name or f"image-{idx + 1}"
-        unique_suffix = uuid.uuid4().hex[:8]
-        final_filename = f"{clean_name}-{unique_suffix}.{ext}"
-        key = f"{folder}/{final_filename}"
-        client.put_object(
-            Bucket=bucket,
-            Key=key,
-            Body=contents,
-            ContentType=file.content_type or "image/jpeg",
-        )
-        public_url = f"{R2_PUBLIC_URL}/{key}"
-        uploaded.append(
+        uploads.append(
             {
-                "image_url": public_url,
-                "filename": final_filename,
+                "key": key,
+                "upload_url": upload_url,
+                "image_url": f"{R2_PUBLIC_URL}/{key}",
+                "headers": {"Content-Type": file.content_type},
+                "expires_in": R2_PRESIGN_EXPIRE,
             }
         )
+    return uploads
+
 
-    return uploaded
+def _head_object(bucket: str, key: str) -> Optional[Dict]:
+    try:
+        return get_r2_client().head_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+
+
+async def confirm_uploaded_keys(keys: List[str], bucket: str, folder: str) -> List[str]:
+    if len(set(keys)) != len(keys):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicate upload keys.",
+        )
+    for key in keys:
+        if not key.startswith(f"{folder}/") or ".." in key:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid upload key: {key}",
+            )
+    heads = await asyncio.gather(
+        *(asyncio.to_thread(_head_object, bucket, key) for key in keys)
+    )
+    invalid = []
+    for key, head in zip(keys, heads):
+        if head is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Upload not found: {key}",
+            )
+        content_type = head.get("ContentType") or ""
+        size = head.get("ContentLength") or 0
+        if not content_type.startswith("image/") or not 0 < size <= R2_MAX_UPLOAD_BYTES:
+            invalid.append(key)
+    if invalid:
+        await asyncio.to_thread(delete_images_from_r2, invalid, bucket)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Uploaded files must be images no larger than "
+            f"{R2_MAX_UPLOAD_BYTES} bytes.",
+        )
+    return [f"{R2_PUBLIC_URL}/{key}" for key in keys]
 
 
 def delete_image_from_r2(key: str):
@@ -56,5 +161,21 @@ def delete_image_from_r2(key: str):
     client.delete_object(Bucket=CLOUDFLARE_BUCKET_NAME_1, Key=key)
 
 
+def delete_images_from_r2(keys: List[str], bucket: str = CLOUDFLARE_BUCKET_NAME_1):
+    client = get_r2_client()
+    for start in range(0, len(keys), R2_DELETE_BATCH_SIZE):
+        batch = keys[start : start + R2_DELETE_BATCH_SIZE]
+        response = client.delete_objects(
+            Bucket=bucket,
+            Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+        )
+        for error in response.get("Errors", []):
+            logger.error(
+                "Failed to delete %s from R2: %s",
+                error.get("Key"),
+                error.get("Message"),
+            )
+
+
 def extract_r2_key(url: str) -> str:
     return url.replace(f"{R2_PUBLIC_URL}/", "")
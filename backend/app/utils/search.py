@@ -0,0 +1,65 @@
+from sqlalchemy import func, select, literal, literal_column, or_, Float
+from app.db.models.product import Product, ProductMaterial
+from dotenv import load_dotenv
+from typing import Optional
+import os
+import re
+
+load_dotenv()
+
+SEARCH_TEXT_CONFIG = os.getenv("SEARCH_TEXT_CONFIG", "simple")
+SEARCH_MAX_TERMS = int(os.getenv("SEARCH_MAX_TERMS", "8"))
+SEARCH_TRGM_WEIGHT = float(os.getenv("SEARCH_TRGM_WEIGHT", "0.5"))
+
+SEARCH_FIELDS = ("name", "product_summary", "description", "category", "motif")
+
+
+def search_terms(term: Optional[str]) -> list[str]:
+    if not term:
+        return []
+    return re.findall(r"\w+", term.lower())[:SEARCH_MAX_TERMS]
+
+
+def build_prefix_query(term: Optional[str]) -> Optional[str]:
+    terms = search_terms(term)
+    if not terms:
+        return None
+    return " & ".join(f"{t}:*" for t in terms)
+
+
+def weighted_vector(text, weight: str):
+    return func.setweight(
+        func.to_tsvector(SEARCH_TEXT_CONFIG, func.coalesce(text, "")),
+        literal_column(f"'{weight}'"),
+    )
+
+
+def product_search_document():
+    materials = (
+        select(func.string_agg(ProductMaterial.material, " "))
+        .where(ProductMaterial.product_id == Product.id)
+        .scalar_subquery()
+    )
+    return (
+        weighted_vector(Product.name, "A")
+        .op("||")(weighted_vector(Product.category, "B"))
+        .op("||")(weighted_vector(Product.motif, "B"))
+        .op("||")(weighted_vector(materials, "B"))
+        .op("||")(weighted_vector(Product.product_summary, "C"))
+        .op("||")(weighted_vector(Product.description, "D"))
+    )
+
+
+def product_search_query(term: str):
+    return func.to_tsquery(SEARCH_TEXT_CONFIG, build_prefix_query(term))
+
+
+def product_search_clause(term: str):
+    typo_match = literal(" ".join(search_terms(term))).op("<%")(Product.name)
+    return or_(Product.search_vector.op("@@")(product_search_query(term)), typo_match)
+
+
+def product_search_rank(term: str):
+    similarity = func.word_similarity(" ".join(search_terms(term)), Product.name)
+    rank = func.ts_rank_cd(Product.search_vector, product_search_query(term), 1)
+    return (func.coalesce(rank, 0) + similarity * SEARCH_TRGM_WEIGHT).cast(Float)
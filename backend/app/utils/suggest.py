@@ -0,0 +1,192 @@
+from sqlalchemy import select
+from sqlalchemy.orm import load_only, noload, selectinload
+from app.core import metrics
+from app.db.models.product import Product
+from app.db.session import AsyncSessionLocal, AsyncReadSessionLocal
+from bisect import bisect_left, insort
+from dotenv import load_dotenv
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import asyncio
+import logging
+import time
+import re
+import os
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+SUGGEST_REFRESH_SECONDS = int(os.getenv("SUGGEST_REFRESH_SECONDS", "300"))
+SUGGEST_MAX_CANDIDATES = int(os.getenv("SUGGEST_MAX_CANDIDATES", "500"))
+SUGGEST_THUMBNAIL_FORMAT = os.getenv("SUGGEST_THUMBNAIL_FORMAT", "webp")
+
+
+def suggest_tokens(text: str) -> List[str]:
+    return re.findall(r"\w+", text.casefold())
+
+
+def pick_thumbnail(images) -> Optional[str]:
+    if not images:
+        return None
+    image = min(images, key=lambda i: (i.position or 0, i.id))
+    variants = [
+        v for v in image.variants or [] if v.get("format") == SUGGEST_THUMBNAIL_FORMAT
+    ]
+    if variants:
+        return min(variants, key=lambda v: v["width"])["image_url"]
+    return image.image_url
+
+
+def discard_sorted(array: List[Tuple[str, int]], item: Tuple[str, int]):
+    idx = bisect_left(array, item)
+    if idx < len(array) and array[idx] == item:
+        del array[idx]
+
+
+def build_entry(product: Product) -> Dict:
+    return {
+        "id": product.id,
+        "name": product.name,
+        "slug": product.slug,
+        "thumbnail": pick_thumbnail(product.images),
+        "tokens": suggest_tokens(product.name),
+        "normalized": " ".join(suggest_tokens(product.name)),
+    }
+
+
+class ProductSuggestIndex:
+    def __init__(self):
+        self.entries: Dict[int, Dict] = {}
+        self.names: List[Tuple[str, int]] = []
+        self.keys: List[Tuple[str, int]] = []
+
+    def replace(self, entries: Iterable[Dict]):
+        new_entries = {entry["id"]: entry for entry in entries}
+        names = sorted((e["normalized"], e["id"]) for e in new_entries.values())
+        keys = sorted(
+            {(token, e["id"]) for e in new_entries.values() for token in e["tokens"]}
+        )
+        self.entries, self.names, self.keys = new_entries, names, keys
+
+    def remove(self, product_id: int):
+        entry = self.entries.pop(product_id, None)
+        if entry is None:
+            return
+        discard_sorted(self.names, (entry["normalized"], product_id))
+        for token in set(entry["tokens"]):
+            discard_sorted(self.keys, (token, product_id))
+
+    def upsert(self, entry: Dict):
+        self.remove(entry["id"])
+        self.entries[entry["id"]] = entry
+        insort(self.names, (entry["normalized"], entry["id"]))
+        for token in set(entry["tokens"]):
+            insort(self.keys, (token, entry["id"]))
+
+    def scan(self, array: List[Tuple[str, int]], prefix: str) -> Iterator[int]:
+        idx = bisect_left(array, (prefix,))
+        end = min(len(array), idx + SUGGEST_MAX_CANDIDATES)
+        while idx < end and array[idx][0].startswith(prefix):
+            yield array[idx][1]
+            idx += 1
+
+    def lookup(self, query: str, limit: int) -> List[Dict]:
+        start = time.perf_counter()
+        terms = suggest_tokens(query)
+        if not terms:
+            return []
+        matches = []
+        for product_id in self.scan(self.names, " ".join(terms)):
+            matches.append(product_id)
+            if len(matches) >= limit:
+                break
+        if len(matches) < limit:
+            seen = set(matches)
+            for product_id in self.scan(self.keys, terms[-1]):
+                if product_id in seen:
+                    continue
+                tokens = self.entries[product_id]["tokens"]
+                if all(any(t.startswith(term) for t in tokens) for term in terms[:-1]):
+                    matches.append(product_id)
+                    seen.add(product_id)
+                    if len(matches) >= limit:
+                        break
+        metrics.observe("suggest.lookup", time.perf_counter() - start)
+        return [
+            {
+                "id": self.entries[product_id]["id"],
+                "name": self.entries[product_id]["name"],
+                "slug": self.entries[product_id]["slug"],
+                "thumbnail": self.entries[product_id]["thumbnail"],
+            }
+            for product_id in matches
+        ]
+
+
+product_suggest = ProductSuggestIndex()
+_refresh_task: Optional[asyncio.Task] = None
+
+
+def suggest_product_query():
+    return select(Product).options(
+        load_only(Product.id, Product.name, Product.slug, Product.is_active),
+        noload(Product.variants),
+        noload(Product.materials),
+        selectinload(Product.images),
+    )
+
+
+async def rebuild_product_suggestions():
+    async with AsyncReadSessionLocal() as db:
+        result = await db.execute(
+            suggest_product_query().where(Product.is_active.is_(True))
+        )
+        product_suggest.replace(build_entry(p) for p in result.scalars().all())
+    metrics.incr("suggest.rebuild")
+
+
+async def refresh_product_suggestions(product_ids: List[int]):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            suggest_product_query().where(Product.id.in_(product_ids))
+        )
+        products = result.scalars().all()
+    found = set()
+    for product in products:
+        found.add(product.id)
+        if product.is_active:
+            product_suggest.upsert(build_entry(product))
+        else:
+            product_suggest.remove(product.id)
+    for product_id in set(product_ids) - found:
+        product_suggest.remove(product_id)
+
+
+def remove_product_suggestions(product_ids: Iterable[int]):
+    for product_id in product_ids:
+        product_suggest.remove(product_id)
+
+
+async def run_suggest_refresher():
+    while True:
+        try:
+            await rebuild_product_suggestions()
+        except Exception as e:
+            logger.exception("Failed to rebuild product suggestions: %s", e)
+        await asyncio.sleep(SUGGEST_REFRESH_SECONDS)
+
+
+def start_suggest_refresher():
+    global _refresh_task
+    if _refresh_task is None:
+        _refresh_task = asyncio.create_task(run_suggest_refresher())
+
+
+async def stop_suggest_refresher():
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
+        _refresh_task = None
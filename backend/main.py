@@ -4,8 +4,16 @@ from dotenv import load_dotenv
 from contextlib import asynccontextmanager
 from app.db.init_db import create_table
 from starlette.middleware.sessions import SessionMiddleware
-from app.routes import user, chatbot, product, cart, order, wishlist, blog
+from app.routes import user, chatbot, product, cart, order, wishlist, blog, metrics
 from app.core.redis import redis_client
+from app.db.session import engine, read_engine
+from app.security.hash import hash_executor
+from app.utils.geocode import close_maps_client
+from app.utils.image_service import shutdown_image_executor
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.suggest import start_suggest_refresher, stop_suggest_refresher
+from app.core.cache import start_cache_listener, stop_cache_listener
+from app.core.compression import CompressionMiddleware
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
 import os
@@ -22,9 +30,19 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print("Redis connection failed:", e)
     FastAPICache.init(RedisBackend(redis_client))
+    start_suggest_refresher()
+    start_cache_listener()
     yield
+    await stop_cache_listener()
+    await stop_suggest_refresher()
     await redis_client.close()
     await redis_client.connection_pool.disconnect()
+    await close_maps_client()
+    hash_executor.shutdown(wait=False)
+    shutdown_image_executor()
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
 
 
 app = FastAPI(title="Caufi Web Backend", lifespan=lifespan)
@@ -34,8 +52,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 app.add_middleware(SessionMiddleware, secret_key=os.getenv("SESSION_SECRET_KEY"))
+app.add_middleware(CompressionMiddleware)
 
 app.include_router(user.router)
 app.include_router(chatbot.router)
@@ -44,3 +64,4 @@ app.include_router(cart.router)
 app.include_router(order.router)
 app.include_router(wishlist.router)
 app.include_router(blog.router)
+app.include_router(metrics.router)
@@ -0,0 +1,32 @@
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.init_db import migrate_product_prices, migrate_product_search  # noqa: E402
+
+MIGRATIONS = {
+    "prices": migrate_product_prices,
+    "search": migrate_product_search,
+}
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Apply the product column migrations and backfill existing "
+        "rows. Safe to run more than once."
+    )
+    parser.add_argument("targets", nargs="*", help=f"any of {', '.join(MIGRATIONS)}")
+    args = parser.parse_args()
+    unknown = set(args.targets) - set(MIGRATIONS)
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(sorted(unknown))}")
+    for target in args.targets or MIGRATIONS:
+        updated = await MIGRATIONS[target]()
+        print(f"{target}: backfilled {updated} products")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
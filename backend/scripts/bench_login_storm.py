@@ -0,0 +1,88 @@
+from typing import Dict, List
+import argparse
+import asyncio
+import time
+import httpx
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def catalog_worker(
+    client: httpx.AsyncClient, path: str, deadline: float, latencies: List[float]
+):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get(path)
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+
+
+async def login_worker(
+    client: httpx.AsyncClient, payload: dict, deadline: float, statuses: Dict[int, int]
+):
+    while time.perf_counter() < deadline:
+        response = await client.post("/api/user/login", json=payload)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+async def run_phase(args, storm: bool) -> dict:
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    limits = httpx.Limits(max_connections=args.catalog_concurrency + args.logins + 10)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        deadline = time.perf_counter() + args.duration
+        workers = [
+            catalog_worker(client, args.path, deadline, latencies)
+            for _ in range(args.catalog_concurrency)
+        ]
+        if storm:
+            payload = {"email": args.email, "password": args.password}
+            workers += [
+                login_worker(client, payload, deadline, statuses)
+                for _ in range(args.logins)
+            ]
+        await asyncio.gather(*workers)
+    return {
+        "requests": len(latencies),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "logins": statuses,
+    }
+
+
+def report(name: str, result: dict):
+    print(
+        f"{name:<10} requests={result['requests']:<6} "
+        f"p50={result['p50'] * 1000:.1f}ms p95={result['p95'] * 1000:.1f}ms "
+        f"p99={result['p99'] * 1000:.1f}ms logins={result['logins']}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Catalog latency on a running server with and without a login storm."
+    )
+    parser.add_argument("--base-url", default="http://localhost:8080")
+    parser.add_argument("--path", default="/api/product/get/all")
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--catalog-concurrency", type=int, default=20)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", default="not-the-password")
+    parser.add_argument("--timeout", type=float, default=30)
+    args = parser.parse_args()
+    report("baseline", await run_phase(args, storm=False))
+    report("storm", await run_phase(args, storm=True))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
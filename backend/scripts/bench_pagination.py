@@ -0,0 +1,132 @@
+from typing import List
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.base import Base  # noqa: E402
+from app.db.models.product import Product  # noqa: E402
+from app.schemas.product import ProductListFilters  # noqa: E402
+from app.utils.filters import (  # noqa: E402
+    product_filter_clauses,
+    product_sort_keys,
+    product_sort_name,
+)
+from app.utils.pagination import (  # noqa: E402
+    apply_keyset_page,
+    encode_cursor,
+    keyset_order,
+)
+
+SEED_PRODUCTS = text(
+    """
+    INSERT INTO product (
+        name, stock_type, shipping_type, motif, category, product_summary,
+        manufacturer, description, slug, is_featured, is_active, created_at,
+        updated_at, min_price, max_price, effective_min_price
+    )
+    SELECT
+        'Batik ' || g, 'ready', 'regular', 'parang',
+        (ARRAY['shirt', 'dress', 'outer', 'scarf'])[1 + g % 4],
+        'summary', 'caufi', 'description', 'bench-' || g, false, true,
+        now() - g * interval '1 minute', now(),
+        p, p + 50000, p - (g % 3) * 10000
+    FROM generate_series(1, :count) AS g,
+        LATERAL (SELECT 100000 + (g * 7919) % 900000 AS p) AS price
+    """
+)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def seed(engine, count: int):
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(SEED_PRODUCTS, {"count": count})
+        await conn.execute(text("ANALYZE product"))
+
+
+async def timed(conn, query, repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        (await conn.execute(query)).all()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def bench_sort(conn, sort: str, pages: List[int], limit: int, repeat: int):
+    f = ProductListFilters(sort=sort)
+    keys, descending = product_sort_keys(f)
+    scope = f"products:{product_sort_name(f)}"
+    base = select(Product.id).where(*product_filter_clauses(f))
+    for page in pages:
+        offset_query = apply_keyset_page(
+            base, keys, descending, scope, None, page, limit
+        )
+        cursor = None
+        if page > 1:
+            previous = (
+                await conn.execute(
+                    select(*keys)
+                    .where(*product_filter_clauses(f))
+                    .order_by(*keyset_order(keys, descending))
+                    .offset((page - 1) * limit - 1)
+                    .limit(1)
+                )
+            ).one()
+            cursor = encode_cursor(scope, list(previous))
+        keyset_query = apply_keyset_page(
+            base, keys, descending, scope, cursor, page, limit
+        )
+        offset = await timed(conn, offset_query, repeat)
+        keyset = await timed(conn, keyset_query, repeat)
+        print(
+            f"{sort:<10} page={page:<6} "
+            f"offset p50={percentile(offset, 50) * 1000:.2f}ms "
+            f"p95={percentile(offset, 95) * 1000:.2f}ms  "
+            f"keyset p50={percentile(keyset, 50) * 1000:.2f}ms "
+            f"p95={percentile(keyset, 95) * 1000:.2f}ms"
+        )
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Compare OFFSET and keyset pagination on a synthetic catalog. "
+        "Tables in the target database are dropped and recreated."
+    )
+    parser.add_argument("--db-url", required=True)
+    parser.add_argument("--products", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=24)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--sorts", nargs="+", default=["newest", "price_low", "asc"])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+    engine = create_async_engine(args.db_url, poolclass=NullPool)
+    try:
+        if not args.skip_seed:
+            await seed(engine, args.products)
+        async with engine.connect() as conn:
+            for sort in args.sorts:
+                await bench_sort(conn, sort, args.pages, args.limit, args.repeat)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,172 @@
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+from tempfile import SpooledTemporaryFile
+from typing import List
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SPOOL_MAX_SIZE = 1024 * 1024
+MODES = ("sequential", "concurrent")
+
+
+def build_files(count: int, size: int) -> List[UploadFile]:
+    chunk = os.urandom(min(size, SPOOL_MAX_SIZE))
+    files = []
+    for idx in range(count):
+        spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        written = 0
+        while written < size:
+            written += spool.write(chunk[: size - written])
+        spool.seek(0)
+        files.append(
+            UploadFile(
+                file=spool,
+                size=size,
+                filename=f"bench-{idx}.jpg",
+                headers=Headers({"content-type": "image/jpeg"}),
+            )
+        )
+    return files
+
+
+async def sequential_put_object(client, files: List[UploadFile], bucket: str):
+    for idx, file in enumerate(files):
+        contents = await file.read()
+        client.put_object(
+            Bucket=bucket,
+            Key=f"bench/sequential-{idx}.jpg",
+            Body=contents,
+            ContentType=file.content_type or "image/jpeg",
+        )
+
+
+def read_status_mib(field: str) -> float:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run_mode(args):
+    import boto3
+    from botocore.config import Config
+    from app.security import r2_config
+
+    client = boto3.client(
+        "s3",
+        endpoint_url=args.endpoint_url,
+        aws_access_key_id=args.access_key,
+        aws_secret_access_key=args.secret_key,
+        region_name="us-east-1",
+        config=Config(signature_version="s3v4"),
+    )
+    r2_config._r2_client = client
+    from app.utils.r2_service import upload_product_images
+
+    files = build_files(args.files, args.size)
+    baseline = read_status_mib("VmRSS")
+    start = time.perf_counter()
+    if args.mode == "sequential":
+        asyncio.run(sequential_put_object(client, files, args.bucket))
+    else:
+        asyncio.run(upload_product_images(files, args.bucket, folder="bench"))
+    elapsed = time.perf_counter() - start
+    print(
+        json.dumps(
+            {
+                "wall": elapsed,
+                "peak_rss_mib": read_status_mib("VmHWM"),
+                "baseline_rss_mib": baseline,
+            }
+        )
+    )
+
+
+def start_moto_server():
+    from moto.server import ThreadedMotoServer
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    return server, f"http://{host}:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the old sequential put_object upload with the "
+        "concurrent upload_fileobj path against an S3-compatible endpoint. "
+        "Starts a local moto server when --endpoint-url is not given."
+    )
+    parser.add_argument("--endpoint-url")
+    parser.add_argument("--access-key", default="bench")
+    parser.add_argument("--secret-key", default="bench")
+    parser.add_argument("--bucket", default="bench-uploads")
+    parser.add_argument("--files", type=int, default=10)
+    parser.add_argument("--size", type=int, default=5 * 1024 * 1024)
+    parser.add_argument("--mode", choices=MODES)
+    args = parser.parse_args()
+    if args.mode:
+        run_mode(args)
+        return
+    server = None
+    if not args.endpoint_url:
+        server, args.endpoint_url = start_moto_server()
+    try:
+        import boto3
+
+        boto3.client(
+            "s3",
+            endpoint_url=args.endpoint_url,
+            aws_access_key_id=args.access_key,
+            aws_secret_access_key=args.secret_key,
+            region_name="us-east-1",
+        ).create_bucket(Bucket=args.bucket)
+        for mode in MODES:
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    os.path.abspath(__file__),
+                    "--mode",
+                    mode,
+                    "--endpoint-url",
+                    args.endpoint_url,
+                    "--access-key",
+                    args.access_key,
+                    "--secret-key",
+                    args.secret_key,
+                    "--bucket",
+                    args.bucket,
+                    "--files",
+                    str(args.files),
+                    "--size",
+                    str(args.size),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{mode:<11} files={args.files} size={args.size} "
+                f"wall={result['wall'] * 1000:.1f}ms "
+                f"peak_rss={result['peak_rss_mib']:.1f}MiB "
+                f"(+{result['peak_rss_mib'] - result['baseline_rss_mib']:.1f}MiB)"
+            )
+    finally:
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+from typing import List
+from sqlalchemy import select, text, update
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.base import Base  # noqa: E402
+from app.db.models.product import Product  # noqa: E402
+from app.utils.search import (  # noqa: E402
+    product_search_clause,
+    product_search_document,
+    product_search_rank,
+)
+
+SEED_PRODUCTS = text(
+    """
+    INSERT INTO product (
+        name, stock_type, shipping_type, motif, category, product_summary,
+        manufacturer, description, slug, is_featured, is_active, created_at,
+        updated_at
+    )
+    SELECT
+        initcap(w[1 + g % 9]) || ' ' || initcap(m[1 + g % 7]) || ' ' || g,
+        'ready', 'regular', m[1 + g % 7], c[1 + g % 5],
+        'Handmade ' || w[1 + (g / 9) % 9] || ' batik from ' || t[1 + g % 6],
+        'caufi',
+        repeat('Traditional ' || m[1 + (g / 7) % 7] || ' pattern on '
+            || w[1 + (g / 3) % 9] || ' fabric, crafted in '
+            || t[1 + (g / 6) % 6] || '. ', 8),
+        'bench-' || g, false, true, now() - g * interval '1 minute', now()
+    FROM generate_series(1, :count) AS g,
+        (SELECT
+            ARRAY['cotton', 'silk', 'linen', 'rayon', 'viscose', 'denim',
+                'chiffon', 'satin', 'voile'] AS w,
+            ARRAY['parang', 'kawung', 'mega mendung', 'truntum', 'sekar jagad',
+                'sidomukti', 'lasem'] AS m,
+            ARRAY['shirt', 'dress', 'outer', 'scarf', 'sarong'] AS c,
+            ARRAY['solo', 'yogyakarta', 'pekalongan', 'cirebon', 'madura',
+                'lasem'] AS t
+        ) AS words
+    """
+)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def seed(engine, count: int):
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(SEED_PRODUCTS, {"count": count})
+        await conn.execute(
+            update(Product).values(search_vector=product_search_document())
+        )
+        await conn.execute(text("ANALYZE product"))
+
+
+def ilike_query(term: str, limit: int):
+    pattern = f"%{term.strip()}%"
+    return (
+        select(Product.id)
+        .where(Product.is_active.is_(True))
+        .where(Product.name.ilike(pattern) | Product.description.ilike(pattern))
+        .order_by(Product.created_at.desc(), Product.id.desc())
+        .limit(limit)
+    )
+
+
+def fts_query(term: str, limit: int):
+    return (
+        select(Product.id)
+        .where(Product.is_active.is_(True))
+        .where(product_search_clause(term))
+        .order_by(product_search_rank(term).desc(), Product.id.desc())
+        .limit(limit)
+    )
+
+
+async def timed(conn, query, repeat: int) -> tuple:
+    samples, rows = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = len((await conn.execute(query)).all())
+        samples.append(time.perf_counter() - start)
+    return samples, rows
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Compare ILIKE and full-text product search on a synthetic "
+        "catalog. Tables in the target database are dropped and recreated."
+    )
+    parser.add_argument("--db-url", required=True)
+    parser.add_argument("--products", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=24)
+    parser.add_argument(
+        "--terms",
+        nargs="+",
+        default=["silk", "mega mendung", "pekalongan", "kaw", "songket"],
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+    engine = create_async_engine(args.db_url, poolclass=NullPool)
+    try:
+        if not args.skip_seed:
+            await seed(engine, args.products)
+        async with engine.connect() as conn:
+            for term in args.terms:
+                for name, query in (
+                    ("ilike", ilike_query(term, args.limit)),
+                    ("fts", fts_query(term, args.limit)),
+                ):
+                    samples, rows = await timed(conn, query, args.repeat)
+                    print(
+                        f"{term!r:<16} {name:<6} rows={rows:<4} "
+                        f"p50={percentile(samples, 50) * 1000:.2f}ms "
+                        f"p95={percentile(samples, 95) * 1000:.2f}ms"
+                    )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,136 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from pydantic import TypeAdapter
+import argparse
+import asyncio
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+from app.core.serializer import dump_json, serialize  # noqa: E402
+from app.db.models.product import (  # noqa: E402
+    Product,
+    ProductImage,
+    ProductMaterial,
+    ProductVariant,
+)
+from app.schemas.product import ProductListResponse  # noqa: E402
+
+NOW = datetime(2025, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc)
+
+
+def build_product(i: int) -> Product:
+    return Product(
+        id=i + 1,
+        name=f"Batik {i}",
+        stock_type="ready",
+        shipping_type="regular",
+        motif="parang",
+        category="shirt",
+        product_summary="summary " * 10,
+        manufacturer="caufi",
+        description="description " * 50,
+        care_guide="care " * 20,
+        slug=f"batik-{i}",
+        is_featured=False,
+        is_active=True,
+        min_price=Decimal("150000.00"),
+        max_price=Decimal("200000.00"),
+        effective_min_price=Decimal("120000.00"),
+        created_at=NOW,
+        updated_at=NOW,
+        materials=[
+            ProductMaterial(material="cotton"),
+            ProductMaterial(material="silk"),
+        ],
+        variants=[
+            ProductVariant(
+                id=i * 10 + j + 1,
+                sku=f"SKU-{i}-{j}",
+                regular_price=Decimal("150000.00"),
+                discount_price=None if j % 2 else Decimal("120000.00"),
+                size="M",
+                stock=3,
+                color="red",
+                hex="#ff0000",
+            )
+            for j in range(4)
+        ],
+        images=[
+            ProductImage(
+                id=i * 10 + j + 1,
+                image_url=f"https://cdn.example.com/{i}/{j}.jpg",
+                position=j,
+                variants=[
+                    {
+                        "width": width,
+                        "format": "webp",
+                        "image_url": f"https://cdn.example.com/{i}/{j}-{width}.webp",
+                    }
+                    for width in (320, 640, 1280)
+                ],
+            )
+            for j in range(3)
+        ],
+    )
+
+
+def build_page(count: int) -> dict:
+    return {
+        "products": [build_product(i) for i in range(count)],
+        "total": count * 10,
+        "category_counts": {"": count * 10, "shirt": count * 10},
+        "facets": {"category": {"shirt": count * 10}},
+        "current_page": 1,
+        "total_pages": 10,
+        "next_cursor": "cursor",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare FastAPI/Pydantic response serialization with the "
+        "orjson fast path on a product listing page."
+    )
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+    page = build_page(args.products)
+    field = create_model_field(
+        name="Response_bench", type_=ProductListResponse, mode="serialization"
+    )
+    adapter = TypeAdapter(ProductListResponse)
+
+    def fastapi_response() -> bytes:
+        content = asyncio.run(
+            serialize_response(field=field, response_content=page, is_coroutine=True)
+        )
+        return json.dumps(
+            content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode()
+
+    def pydantic_json() -> bytes:
+        return adapter.dump_json(
+            adapter.validate_python(page, from_attributes=True), by_alias=True
+        )
+
+    def orjson_fast_path() -> bytes:
+        return dump_json(serialize(ProductListResponse, page))
+
+    expected = json.loads(orjson_fast_path())
+    for fn in (fastapi_response, pydantic_json, orjson_fast_path):
+        body = fn()
+        elapsed = timeit.timeit(fn, number=args.number) / args.number
+        print(
+            f"{fn.__name__:<18} {elapsed * 1000:8.2f}ms bytes={len(body):<8} "
+            f"same={json.loads(body) == expected}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import redis.asyncio as redis
+import asyncio
+import pytest
+import os
+
+import app.core.cache as cache
+
+TEST_REDIS_URL = os.getenv("TEST_REDIS_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_REDIS_URL, reason="TEST_REDIS_URL is not set")
+
+LONG_EXPIRE = 30
+SHORT_EXPIRE = 1
+
+
+def run_with_redis(scenario):
+    async def main():
+        client = redis.from_url(TEST_REDIS_URL)
+        original = cache.redis_client
+        cache.redis_client = client
+        try:
+            await client.flushdb()
+            return await scenario(client)
+        finally:
+            cache.redis_client = original
+            await client.aclose()
+
+    return asyncio.run(main())
+
+
+def test_short_entry_does_not_shorten_tag_ttl():
+    long_key = cache.build_cache_key("products:all", "long")
+    short_key = cache.build_cache_key("products:single", "short")
+    tag_key = cache.build_tag_key("product:1")
+
+    async def scenario(client):
+        await cache.cache_set(long_key, b"long", LONG_EXPIRE, ["product:1"])
+        await cache.cache_set(short_key, b"short", SHORT_EXPIRE, ["product:1"])
+        assert await client.ttl(tag_key) > SHORT_EXPIRE
+        await asyncio.sleep(SHORT_EXPIRE + 0.5)
+        assert await client.exists(long_key)
+        await cache.invalidate_tags("product:1")
+        return await client.exists(long_key, tag_key)
+
+    assert run_with_redis(scenario) == 0
+
+
+def test_new_tag_set_gets_entry_ttl():
+    key = cache.build_cache_key("products:all", "fresh")
+    tag_key = cache.build_tag_key("product:2")
+
+    async def scenario(client):
+        await cache.cache_set(key, b"fresh", LONG_EXPIRE, ["product:2"])
+        return await client.ttl(tag_key)
+
+    assert 0 < run_with_redis(scenario) <= LONG_EXPIRE
@@ -0,0 +1,200 @@
+from decimal import Decimal
+from sqlalchemy import event, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+import asyncio
+import pytest
+import os
+
+from app.db.base import Base
+from app.db.models.user import User
+from app.db.models.product import (
+    Cart,
+    CartItem,
+    Product,
+    ProductImage,
+    ProductMaterial,
+    ProductVariant,
+    Wishlist,
+)
+from app.core.serializer import serialize
+from app.routes.cart import api_cart_all
+from app.routes.product import api_product_all, api_product_detail
+from app.routes.wishlist import api_wishlist_get
+from app.utils.facets import build_facet_query
+from app.schemas.product import (
+    ProductDataOut,
+    ProductListFilters,
+    ProductListResponse,
+    WishlistOut,
+)
+from app.schemas.user import UserPrincipal
+from fastapi import Response
+
+TEST_DB_URL = os.getenv("TEST_DB_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_DB_URL, reason="TEST_DB_URL is not set")
+
+PRODUCT_COUNT = 6
+LIST_BUDGET = 5
+DETAIL_BUDGET = 4
+CART_BUDGET = 7
+WISHLIST_BUDGET = 5
+
+
+FACET_PRODUCT_SCANS = 1
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self.on_execute)
+
+    def on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+async def seed(db: AsyncSession) -> dict:
+    user = User(name="Budget User", user_name="budget", email="budget@example.com")
+    db.add(user)
+    products = []
+    for i in range(PRODUCT_COUNT):
+        product = Product(
+            name=f"Batik {i}",
+            stock_type="ready",
+            shipping_type="regular",
+            motif="parang",
+            category="shirt" if i % 2 else "dress",
+            product_summary="summary",
+            manufacturer="caufi",
+            description="description",
+            care_guide="care",
+            slug=f"batik-{i}",
+            materials=[ProductMaterial(material="cotton")],
+            images=[
+                ProductImage(image_url=f"https://cdn.example.com/{i}/{j}.jpg")
+                for j in range(2)
+            ],
+            variants=[
+                ProductVariant(
+                    sku=f"SKU-{i}-{j}",
+                    regular_price=Decimal("100000") + j,
+                    size="M",
+                    stock=5,
+                    color="red",
+                    hex="#ff0000",
+                )
+                for j in range(2)
+            ],
+        )
+        products.append(product)
+    db.add_all(products)
+    await db.flush()
+    cart = Cart(user_id=user.id)
+    db.add(cart)
+    await db.flush()
+    db.add_all(
+        CartItem(cart_id=cart.id, variant_id=p.variants[0].id, quantity=1)
+        for p in products
+    )
+    db.add_all(Wishlist(user_id=user.id, product_id=p.id) for p in products)
+    await db.commit()
+    return {
+        "principal": UserPrincipal(id=user.id, email=user.email),
+        "product_id": products[0].id,
+    }
+
+
+def relation_scans(plan: dict, relation: str) -> int:
+    own = 1 if plan.get("Relation Name") == relation else 0
+    return own + sum(relation_scans(p, relation) for p in plan.get("Plans", []))
+
+
+def run_budgeted(scenario) -> int:
+    async def main():
+        engine = create_async_engine(TEST_DB_URL, poolclass=NullPool)
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = sessionmaker(
+            bind=engine, class_=AsyncSession, expire_on_commit=False
+        )
+        try:
+            async with session_factory() as db:
+                data = await seed(db)
+            counter = StatementCounter(engine)
+            async with session_factory() as db:
+                counter.count = 0
+                await scenario(db, data)
+                return counter.count
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def test_product_list_statement_budget():
+    async def scenario(db, data):
+        result = await api_product_all.__wrapped__(
+            f=ProductListFilters(),
+            page=1,
+            limit=24,
+            cursor=None,
+            view="full",
+            db=db,
+        )
+        assert len(serialize(ProductListResponse, result)["products"]) == PRODUCT_COUNT
+
+    assert run_budgeted(scenario) <= LIST_BUDGET
+
+
+def test_product_detail_statement_budget():
+    async def scenario(db, data):
+        product = await api_product_detail.__wrapped__(
+            identifier=str(data["product_id"]), db=db
+        )
+        assert serialize(ProductDataOut, product)["id"] == data["product_id"]
+
+    assert run_budgeted(scenario) <= DETAIL_BUDGET
+
+
+def test_cart_statement_budget():
+    async def scenario(db, data):
+        response = await api_cart_all(current_user=data["principal"], db=db)
+        assert response.status_code == 200
+
+    assert run_budgeted(scenario) <= CART_BUDGET
+
+
+def test_wishlist_statement_budget():
+    async def scenario(db, data):
+        items = await api_wishlist_get(
+            response=Response(),
+            page=1,
+            limit=24,
+            cursor=None,
+            db=db,
+            current_user=data["principal"],
+        )
+        assert [WishlistOut.model_validate(item) for item in items]
+
+    assert run_budgeted(scenario) <= WISHLIST_BUDGET
+
+
+def test_product_facets_scan_product_once():
+    async def scenario(db, data):
+        f = ProductListFilters(
+            category="shirt", material="cotton", size="M", color="red", min_price=1
+        )
+        sql = build_facet_query(f, offset=0, limit=25).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+        conn = await db.connection()
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = result.scalar()[0]["Plan"]
+        assert relation_scans(plan, "product") == FACET_PRODUCT_SCANS
+
+    run_budgeted(scenario)